@@ -6,27 +6,74 @@ import json
 import csv
 import re
 import hashlib
+import importlib
+import io
+import cProfile
+import pstats
+import tracemalloc
+import sys
+import mimetypes
+import shutil
+import sqlite3
+import atexit
+import queue
+import signal
+import subprocess
+import argparse
+import threading
+import heapq
+import urllib.robotparser
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from datetime import datetime
 from pathlib import Path
-from urllib.parse import urlparse, urljoin, parse_qs
-
-# Third-party imports
-import pyautogui
-import pyperclip
-import spacy              # Spacy for NLP
-import numpy as np          # Numpy for numerical operation
-import requests
-import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.firefox import GeckoDriverManager
-import psutil
+from urllib.parse import urlparse, urljoin, parse_qs, quote, quote_plus, urlencode
+
+
+class LazyImport:
+    """
+    Stand-in for a module (or a name inside one) that is imported on first use.
+
+    Attribute access and calls are forwarded to the real object, so code can
+    use it exactly like the eager import it replaces.
+    """
+
+    def __init__(self, module, attr=None):
+        self._module = module
+        self._attr = attr
+        self._obj = None
+
+    def _load(self):
+        if self._obj is None:
+            obj = importlib.import_module(self._module)
+            self._obj = getattr(obj, self._attr) if self._attr else obj
+        return self._obj
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self._load()(*args, **kwargs)
+
+
+# Third-party imports, loaded only on the code paths that need them
+pyautogui = LazyImport('pyautogui')
+spacy = LazyImport('spacy')              # Spacy for NLP
+requests = LazyImport('requests')
+HTTPAdapter = LazyImport('requests.adapters', 'HTTPAdapter')
+BeautifulSoup = LazyImport('bs4', 'BeautifulSoup')
+pd = LazyImport('pandas')
+webdriver = LazyImport('selenium.webdriver')
+By = LazyImport('selenium.webdriver.common.by', 'By')
+Keys = LazyImport('selenium.webdriver.common.keys', 'Keys')
+FirefoxService = LazyImport('selenium.webdriver.firefox.service', 'Service')
+FirefoxOptions = LazyImport('selenium.webdriver.firefox.options', 'Options')
+WebDriverWait = LazyImport('selenium.webdriver.support.ui', 'WebDriverWait')
+EC = LazyImport('selenium.webdriver.support.expected_conditions')
+GeckoDriverManager = LazyImport('webdriver_manager.firefox', 'GeckoDriverManager')
+psutil = LazyImport('psutil')
 
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__)) # Base directory of the script
@@ -107,6 +154,16 @@ CONFIG = {
         ]
     },
     
+    # Search result pages that can be opened directly, skipping the search bar.
+    # {query} is replaced with the URL-encoded purpose
+    'SEARCH_URL_TEMPLATES': {
+        'medium.com': "https://medium.com/search?q={query}",
+        'x.com': "https://x.com/search?q={query}&src=typed_query",
+        'twitter.com': "https://x.com/search?q={query}&src=typed_query",
+        'wikipedia.org': "https://en.wikipedia.org/w/index.php?search={query}&fulltext=1",
+        'quora.com': "https://www.quora.com/search?q={query}"
+    },
+    
     'POST_SELECTORS': {
         'medium.com': [
             "article h2 a",  # Most common Medium story link pattern
@@ -193,10 +250,653 @@ CONFIG.update({
     'SEARCH_RESULTS_WAIT_TIME': 8,  # Increased from 5
 })
 
+CONFIG.update({
+    # Readiness checks: the wait times above are upper bounds, these control how
+    # quickly we notice that a page is actually ready
+    'READINESS_POLL_INTERVAL': 0.25,  # Seconds between page state checks
+    'DOM_SETTLE_TIME': 0.75,          # Seconds without DOM mutations before the page counts as settled
+    'NETWORK_IDLE_TIME': 0.5,         # Seconds without in-flight requests before the network counts as idle
+})
+
+CONFIG.update({
+    # 'profile': visible Firefox with the real user profile (needed for pyautogui)
+    # 'scrape': headless Firefox with a throwaway profile that blocks heavy resources
+    'BROWSER_MODE': 'profile',
+    'HEADLESS_WINDOW_SIZE': (1366, 900),
+    # Requests to these hosts (and their subdomains) are refused in scrape mode
+    'BLOCKED_HOSTS': [
+        'google-analytics.com', 'googletagmanager.com', 'doubleclick.net',
+        'googlesyndication.com', 'facebook.net', 'scorecardresearch.com',
+        'quantserve.com', 'branch.io', 'segment.io', 'segment.com',
+        'amplitude.com', 'hotjar.com', 'ads-twitter.com', 'analytics.twitter.com'
+    ],
+    # Sites that need a login; their cookies are injected in scrape mode
+    'LOGIN_REQUIRED_SITES': ['x.com'],
+    # Cookie exports (JSON list of cookie dicts, as returned by driver.get_cookies())
+    'COOKIE_FILES': {
+        'x.com': os.path.join(BASE_DIR, 'cookies', 'x.com.json')
+    }
+})
+
+CONFIG.update({
+    'NLP_BATCH_SIZE': 256,    # Queries per nlp.pipe batch in batch mode
+    'NLP_N_PROCESS': 1,       # spaCy worker processes in batch mode
+    'QUERY_CONCURRENCY': 1,   # Search jobs run at once in batch mode (bounded by DRIVER_POOL_SIZE)
+})
+
+CONFIG.update({
+    # Resolved geckodriver path, so GeckoDriverManager doesn't check for updates
+    # on every run; refresh with --refresh-driver
+    'DRIVER_CACHE_FILE': os.path.join(BASE_DIR, '.geckodriver.json'),
+})
+
+CONFIG.update({
+    # Warm browser sessions reused across queries. Keep the size at 1 while
+    # running against the real profile: Firefox locks a profile to one instance.
+    # Scrape mode uses throwaway profiles, so several sessions can run at once
+    'DRIVER_POOL_SIZE': 1,
+    'DRIVER_MAX_PAGES': 50,  # Recycle a browser after this many pages (a search job counts as one)
+    'BROWSER_RSS_LIMIT_MB': 1500,  # ...or once its processes use more memory than this
+    # Pidfiles listing the processes of our browsers, for reaping after a crash
+    'BROWSER_PIDFILE_DIR': os.path.join(BASE_DIR, 'scraped_content', 'browsers'),
+})
+
+CONFIG.update({
+    # Where scraped records go: any of 'csv', 'sqlite' and 'parquet'
+    'STORAGE_SINKS': ['csv', 'sqlite'],
+    'SQLITE_PATH': os.path.join(BASE_DIR, 'scraped_content', 'scraped_data.db'),
+    'PARQUET_DIR': os.path.join(BASE_DIR, 'scraped_content', 'parquet'),
+    'DISPLAY_PAGE_SIZE': 10,       # Records shown per page of results
+    'DISPLAY_PREVIEW_CHARS': 300,  # Characters of main_content shown per record
+})
+
+CONFIG.update({
+    # Records are written by one background thread fed through a bounded queue
+    'ASYNC_WRITES': True,
+    'WRITER_QUEUE_SIZE': 1000,     # Scrapers wait only when this many records are pending
+    'WRITER_BATCH_SIZE': 50,       # Write as soon as this many records are pending...
+    'WRITER_FLUSH_INTERVAL': 2.0,  # ...or the oldest pending record is this many seconds old
+    'WRITER_FSYNC': 'batch',       # 'never', 'batch' (after every write) or 'interval'
+    'WRITER_FSYNC_INTERVAL': 30,   # Seconds between fsyncs with the 'interval' policy
+})
+
+CONFIG.update({
+    # Index of URLs already scraped, so they are skipped before any navigation
+    'SEEN_INDEX_FILE': os.path.join(BASE_DIR, 'scraped_content', 'seen_urls.db'),
+    'RESCRAPE_TTL_HOURS': None,  # Re-scrape URLs older than this; None never re-scrapes
+    # Query parameters that don't change the page (Medium's source/sk, utm_*, ...)
+    'TRACKING_PARAMS': ['source', 'sk', 'gi', 'fbclid', 'gclid', 'ref', 'referrer',
+                        'responsesOpen', 'mc_cid', 'mc_eid', 'src'],
+    'TRACKING_PARAM_PREFIXES': ['utm_']
+})
+
+CONFIG.update({
+    # Crawl frontier: persistent queue of post URLs with per-domain politeness
+    'FRONTIER_FILE': os.path.join(BASE_DIR, 'scraped_content', 'frontier.db'),
+    'DOMAIN_RATE': {'medium.com': 2.0, 'x.com': 1.0, 'generic': 1.0},  # Requests per second per host
+    'DOMAIN_BURST': 2,           # Requests a host may get back to back
+    'DOMAIN_CONCURRENCY': 2,     # Requests in flight per host
+    'FRONTIER_WEIGHTS': {'medium.com': 2, 'x.com': 1, 'generic': 1},  # Share of turns per site type
+    'RESPECT_ROBOTS': True,      # Skip URLs robots.txt disallows and honour Crawl-delay
+    'ROBOTS_TTL_HOURS': 24,      # How long a fetched robots.txt is trusted
+})
+
+CONFIG.update({
+    # Stage timings and counters (--metrics); written to METRICS_DIR at exit as
+    # scraper.prom (Prometheus text format) and run_<session>.json
+    'METRICS_ENABLED': False,
+    'METRICS_DIR': os.path.join(BASE_DIR, 'scraped_content', 'metrics'),
+    'METRICS_PORT': None,  # Also serve /metrics on this local port
+})
+
+CONFIG.update({
+    # Profiling (--profile); reports go to PROFILE_DIR/<session>/
+    'PROFILE_DIR': os.path.join(BASE_DIR, 'scraped_content', 'profiles'),
+    'PROFILE_STAGE': None,             # Set by --profile-stage
+    'PROFILE_TOP': 40,                 # Entries per cProfile/tracemalloc report
+    'PROFILE_SAMPLE_INTERVAL': 0.01,   # Seconds between stack samples
+    'PROFILE_MEMORY_EVERY': 10,        # Pages between tracemalloc snapshots
+    'PROFILE_TRACEMALLOC_FRAMES': 5,   # Stack depth recorded per allocation
+    'PROFILE_RSS_INTERVAL': 5,         # Seconds between browser RSS readings
+})
+
+CONFIG.update({
+    # Batch job progress for --resume
+    'CHECKPOINT_FILE': os.path.join(BASE_DIR, 'scraped_content', 'checkpoint.json'),
+    'CHECKPOINT_INTERVAL': 30,  # Seconds between checkpoint writes
+})
+
+CONFIG.update({
+    # Scrolling stops when a scroll adds nothing this many times in a row,
+    # or when the time budget is used up
+    'SCROLL_MAX_STALLS': 1,
+    'SCROLL_TIME_BUDGET': 60,       # Seconds spent scrolling a results page
+    'POST_SCROLL_TIME_BUDGET': 15,  # Seconds spent scrolling a post
+})
+
+CONFIG.update({
+    # Other hosts to scrape as one of the known site types, e.g. a local copy
+    # used by benchmark.py: {'127.0.0.1:8000': 'medium.com'}
+    'SITE_ALIASES': {},
+    'SCRAPE_CONCURRENCY': 4,  # Posts scraped in parallel (HTTP workers / browser sessions)
+    # Harvested links must match these to count as posts (sites not listed accept any link)
+    'POST_URL_PATTERNS': {
+        'medium.com': r'(/p/[0-9a-f]{8,}|-[0-9a-f]{8,12})(?:[/?#]|$)',
+        'x.com': r'/status/\d+'
+    }
+})
+
+CONFIG.update({
+    'DOWNLOAD_MEDIA': True,         # Download media_urls of every saved record
+    'MEDIA_CONCURRENCY': 8,         # Parallel media downloads
+    'MEDIA_PER_HOST_LIMIT': 4,      # Parallel downloads per host
+    'MEDIA_TIMEOUT': (5, 30),       # Connect and read timeout in seconds
+    'MEDIA_RETRIES': 3,             # Attempts per file
+    'MEDIA_BACKOFF': 0.5,           # Base delay in seconds, doubled after each failed attempt
+    # Media is stored by SHA-256 of its bytes under MEDIA_DIR/ab/cd/<hash><ext>,
+    # with an index from URL to hash so known URLs are never fetched again
+    'MEDIA_INDEX_FILE': os.path.join(BASE_DIR, 'media', 'media_index.db'),
+})
+
+CONFIG.update({
+    # Try selectors that have stopped matching after the others
+    'ADAPTIVE_SELECTORS': True,
+    'SELECTOR_STATS_FILE': os.path.join(BASE_DIR, 'scraped_content', 'selector_stats.db'),
+    'SELECTOR_DEAD_AFTER': 20,  # Pages in a row where others found the field before a selector counts as dead
+    'SELECTOR_PROBE_EVERY': 10,  # Every Nth page of a site also tries dead selectors, so revived ones move back
+})
+
+CONFIG.update({
+    'HTTP_FAST_PATH': True,   # Try plain HTTP + BeautifulSoup before using the browser
+    'HTTP_TIMEOUT': 10,       # Seconds per HTTP request
+    'HTTP_POOL_SIZE': 10,     # Keep-alive connections per host
+    'HTTP_HEADERS': {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:135.0) Gecko/20100101 Firefox/135.0',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.5'
+    }
+})
+
+CONFIG.update({
+    # Selectors tried before the SUPPORTED_SITES ones, keyed by CSV column
+    # ('publication' is only used for the engagement summary)
+    'PRIMARY_SELECTORS': {
+        'medium.com': {
+            'author': ['a[data-testid="authorName"]'],
+            'publication': ['a[data-testid="publicationName"]'],
+            'read_time': ['span[data-testid="storyReadTime"]'],
+            'claps_likes': ['button[data-testid="headerClapButton"]'],
+            'replies': ['span.pw-responses-count'],
+            'main_content': ['p.pw-post-body-paragraph'],
+            'title': ['h1[data-selectable-paragraph]'],
+            'media_urls': ['figure.paragraph-image img']
+        },
+        # Any other site (e.g. Wikipedia): common article markup
+        'generic': {
+            'title': ['h1', 'title'],
+            'author': ['[rel="author"]', '[itemprop="author"]', '.author'],
+            'date_posted': ['time[datetime]', 'time'],
+            'main_content': ['article p', 'main p', '[role="main"] p', '#content p'],
+            'media_urls': ['article img', 'main img', '[role="main"] img'],
+            'code_snippets': ['article pre', 'main pre']
+        }
+    },
+    # SUPPORTED_SITES keys that don't match a CSV column name
+    'FIELD_COLUMNS': {
+        'medium.com': {'media': 'media_urls'},
+        'x.com': {
+            'tweet': 'main_content',
+            'likes': 'claps_likes',
+            'media': 'media_urls',
+            'quoted_tweet': 'quoted_content',
+            'links': 'embedded_links'
+        }
+    },
+    # How each column is read from its elements and joined; anything not listed
+    # takes the text of the first match
+    'FIELD_MODES': {
+        'main_content': ('text', '\n\n'),
+        'code_snippets': ('text', '\n\n'),
+        'quoted_content': ('text', '\n\n'),
+        'topics_tags': ('text', ', '),
+        'media_urls': ('src', '||'),
+        'embedded_links': ('link', '||'),
+        'date_posted': ('datetime', None)
+    },
+    # Fields that must be non-empty for a page to count as scraped; if the HTTP
+    # fast path misses any of them the URL is escalated to Selenium
+    'REQUIRED_FIELDS': {
+        'medium.com': ['title', 'main_content'],
+        'x.com': ['main_content'],
+        'generic': ['title', 'main_content']
+    },
+    # Fields summarised at the top of main_content, with their labels
+    'ENGAGEMENT_FIELDS': {
+        'medium.com': [
+            ('author', 'Author'),
+            ('publication', 'Publication'),
+            ('read_time', 'Read time'),
+            ('claps_likes', 'Claps'),
+            ('replies', 'Comments')
+        ]
+    }
+})
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-nlp = spacy.load("en_core_web_sm")
+
+# Metrics
+# Span timings per pipeline stage and counters (retries, selector misses,
+# bytes), exported as Prometheus text and a per-run JSON summary. Disabled
+# spans are a shared no-op context manager.
+class _Span:
+    """Times one stage; use through Metrics.span()."""
+
+    __slots__ = ('metrics', 'stage', 'started')
+
+    def __init__(self, metrics, stage):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = t.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.stage, t.perf_counter() - self.started)
+        return False
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class Metrics:
+    """
+    Stage timings and counters of the current run.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.timings = {}   # stage -> list of seconds
+        self.counters = {}  # name -> total
+        self.started_at = datetime.now().isoformat()
+
+    @property
+    def enabled(self):
+        return CONFIG['METRICS_ENABLED']
+
+    def span(self, stage):
+        """
+        Time a block as one sample of a stage.
+
+        Args:
+            stage (str): Stage name, e.g. 'driver_get'
+
+        Returns:
+            Context manager (a no-op when metrics are disabled)
+        """
+        return _Span(self, stage) if CONFIG['METRICS_ENABLED'] else _NO_SPAN
+
+    def observe(self, stage, seconds):
+        """Record one duration for a stage."""
+        with self._lock:
+            self.timings.setdefault(stage, []).append(seconds)
+
+    def incr(self, name, value=1):
+        """Add to a counter (does nothing when metrics are disabled)."""
+        if not CONFIG['METRICS_ENABLED']:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def summary(self):
+        """
+        Summarize the run.
+
+        Returns:
+            dict: 'session', 'started_at', 'stages' (count, p50/p95/max/total
+            in milliseconds per stage) and 'counters'
+        """
+        with self._lock:
+            timings = {stage: sorted(values) for stage, values in self.timings.items()}
+            counters = dict(self.counters)
+
+        def quantile(values, q):
+            return values[min(len(values) - 1, int(q * len(values)))]
+
+        return {
+            'session': CONFIG['CURRENT_SESSION_ID'],
+            'started_at': self.started_at,
+            'stages': {
+                stage: {
+                    'count': len(values),
+                    'p50_ms': round(quantile(values, 0.5) * 1000, 3),
+                    'p95_ms': round(quantile(values, 0.95) * 1000, 3),
+                    'max_ms': round(values[-1] * 1000, 3),
+                    'total_ms': round(sum(values) * 1000, 3)
+                }
+                for stage, values in sorted(timings.items())
+            },
+            'counters': counters
+        }
+
+    def prometheus_text(self):
+        """
+        Render the metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: A scraper_stage_seconds summary and one scraper_<name>_total
+            counter per counter
+        """
+        summary = self.summary()
+        lines = ['# HELP scraper_stage_seconds Time spent per pipeline stage',
+                 '# TYPE scraper_stage_seconds summary']
+        for stage, stats in summary['stages'].items():
+            for quantile, key in (('0.5', 'p50_ms'), ('0.95', 'p95_ms')):
+                lines.append(f'scraper_stage_seconds{{stage="{stage}",quantile="{quantile}"}} {stats[key] / 1000:.6f}')
+            lines.append(f'scraper_stage_seconds_sum{{stage="{stage}"}} {stats["total_ms"] / 1000:.6f}')
+            lines.append(f'scraper_stage_seconds_count{{stage="{stage}"}} {stats["count"]}')
+        for name, value in sorted(summary['counters'].items()):
+            metric = f"scraper_{re.sub(r'[^a-zA-Z0-9_]', '_', name)}_total"
+            lines.append(f'# TYPE {metric} counter')
+            lines.append(f'{metric} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def export(self):
+        """
+        Write the Prometheus text file and this run's JSON summary to METRICS_DIR.
+
+        Returns:
+            Path or None: The JSON summary, or None if metrics are disabled
+        """
+        if not CONFIG['METRICS_ENABLED']:
+            return None
+        directory = Path(CONFIG['METRICS_DIR'])
+        directory.mkdir(parents=True, exist_ok=True)
+        targets = {
+            directory / 'scraper.prom': self.prometheus_text(),
+            directory / f"run_{CONFIG['CURRENT_SESSION_ID']}.json": json.dumps(self.summary(), indent=2)
+        }
+        for path, text in targets.items():
+            tmp = path.with_suffix(path.suffix + '.tmp')
+            tmp.write_text(text, encoding='utf-8')
+            tmp.replace(path)
+        return directory / f"run_{CONFIG['CURRENT_SESSION_ID']}.json"
+
+
+metrics = Metrics()
+
+
+def timed(stage):
+    """Decorator recording every call of a function as a span of the given stage."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if stage == CONFIG['PROFILE_STAGE']:
+                with metrics.span(stage):
+                    return _profiler.run_stage(func, *args, **kwargs)
+            if not CONFIG['METRICS_ENABLED']:
+                return func(*args, **kwargs)
+            with _Span(metrics, stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def get_page(driver, url):
+    """driver.get(url), timed as the 'driver_get' stage."""
+    with metrics.span('driver_get'):
+        driver.get(url)
+
+
+def serve_metrics(port):
+    """
+    Serve the Prometheus text format on http://127.0.0.1:<port>/metrics from a daemon thread.
+
+    Args:
+        port (int): Port to listen on
+
+    Returns:
+        ThreadingHTTPServer: The running server
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = metrics.prometheus_text().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='metrics', daemon=True).start()
+    logger.info(f"Serving metrics on http://127.0.0.1:{port}/metrics")
+    return server
+
+
+def enable_metrics(port=None):
+    """Turn metrics on, export them at exit and optionally serve them over HTTP."""
+    CONFIG['METRICS_ENABLED'] = True
+    atexit.register(metrics.export)
+    port = port or CONFIG['METRICS_PORT']
+    if port:
+        serve_metrics(port)
+
+
+# Profiling
+# Opt-in (--profile): cProfile over the run or one stage, a sampling profiler
+# over all threads, tracemalloc diffs between pages and the RSS of the
+# browser processes. Output goes to PROFILE_DIR/<session>/.
+class Profiler:
+    """
+    Collects the profiles for one session.
+
+    Modes:
+        cpu: cProfile of the main thread for the whole run, or of every call
+            of PROFILE_STAGE (in any thread) when a stage is given
+        sample: stack samples of all threads every PROFILE_SAMPLE_INTERVAL
+            seconds, written as folded stacks (flame graph input)
+        memory: tracemalloc snapshot diffs every PROFILE_MEMORY_EVERY pages
+        browser: RSS of our geckodriver/Firefox child processes every
+            PROFILE_RSS_INTERVAL seconds
+    """
+
+    def __init__(self, modes, stage=None):
+        self.modes = set(modes)
+        self.stage = stage
+        self.directory = Path(CONFIG['PROFILE_DIR']) / CONFIG['CURRENT_SESSION_ID']
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads = []
+        self._cpu = None
+        self._stage_stats = None
+        self._skipped_calls = 0
+        self._samples = {}
+        self._pages = 0
+        self._first_snapshot = self._last_snapshot = None
+
+    def start(self):
+        """Start the selected profilers."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if 'cpu' in self.modes and not self.stage:
+            self._cpu = cProfile.Profile()
+            self._cpu.enable()
+        if 'memory' in self.modes:
+            tracemalloc.start(CONFIG['PROFILE_TRACEMALLOC_FRAMES'])
+            self._first_snapshot = self._last_snapshot = tracemalloc.take_snapshot()
+        if 'sample' in self.modes:
+            self._spawn(self._sample_loop, 'profile-sampler')
+        if 'browser' in self.modes:
+            self._spawn(self._rss_loop, 'profile-rss')
+        logger.info(f"Profiling ({', '.join(sorted(self.modes))}) to {self.directory}")
+
+    def _spawn(self, target, name):
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def run_stage(self, func, *args, **kwargs):
+        """Call func under its own cProfile and add the result to the stage profile."""
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+ allows one active profiler at a time, e.g. another
+            # thread is already inside the stage
+            with self._lock:
+                self._skipped_calls += 1
+            return func(*args, **kwargs)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.disable()
+            with self._lock:
+                if self._stage_stats is None:
+                    self._stage_stats = pstats.Stats(profile)
+                else:
+                    self._stage_stats.add(profile)
+
+    def page_done(self):
+        """Count a scraped page and diff memory every PROFILE_MEMORY_EVERY pages."""
+        if 'memory' not in self.modes:
+            return
+        with self._lock:
+            self._pages += 1
+            if self._pages % CONFIG['PROFILE_MEMORY_EVERY']:
+                return
+            snapshot = tracemalloc.take_snapshot()
+            previous, self._last_snapshot = self._last_snapshot, snapshot
+            pages = self._pages
+        self._write_memory_diff(f"after page {pages}", snapshot, previous)
+
+    def _write_memory_diff(self, title, snapshot, previous):
+        stats = snapshot.compare_to(previous, 'lineno')[:CONFIG['PROFILE_TOP']]
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [f"== {title} ({datetime.now().isoformat()}): "
+                 f"traced {current / 1e6:.1f} MB, peak {peak / 1e6:.1f} MB"]
+        lines.extend(str(stat) for stat in stats)
+        with open(self.directory / 'memory.txt', 'a', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n\n')
+
+    def _sample_loop(self):
+        own = threading.get_ident()
+        while not self._stop.wait(CONFIG['PROFILE_SAMPLE_INTERVAL']):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                key = ';'.join(reversed(stack))
+                with self._lock:
+                    self._samples[key] = self._samples.get(key, 0) + 1
+
+    def _rss_loop(self):
+        path = self.directory / 'browser_rss.csv'
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['timestamp', 'pid', 'name', 'rss_bytes'])
+            me = psutil.Process()
+            while not self._stop.wait(CONFIG['PROFILE_RSS_INTERVAL']):
+                now = datetime.now().isoformat()
+                total = 0
+                for child in me.children(recursive=True):
+                    try:
+                        name = child.name()
+                        if not any(browser in name.lower() for browser in ('firefox', 'geckodriver')):
+                            continue
+                        rss = child.memory_info().rss
+                    except psutil.Error:
+                        continue  # Exited between listing and reading
+                    total += rss
+                    writer.writerow([now, child.pid, name, rss])
+                writer.writerow([now, '', 'total', total])
+                f.flush()
+
+    def stop(self):
+        """Stop profiling and write the reports."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        if self._cpu is not None:
+            self._cpu.disable()
+            self._write_stats(pstats.Stats(self._cpu), 'cpu')
+        if self._stage_stats is not None:
+            self._write_stats(self._stage_stats, f"cpu_{self.stage}")
+            if self._skipped_calls:
+                logger.info(f"{self._skipped_calls} concurrent {self.stage} calls were not profiled")
+        if self._samples:
+            with open(self.directory / 'stacks.folded', 'w', encoding='utf-8') as f:
+                for stack, count in sorted(self._samples.items(), key=lambda item: -item[1]):
+                    f.write(f"{stack} {count}\n")
+        if 'memory' in self.modes and tracemalloc.is_tracing():
+            self._write_memory_diff("whole run", tracemalloc.take_snapshot(), self._first_snapshot)
+            tracemalloc.stop()
+        logger.info(f"Profiles written to {self.directory}")
+
+    def _write_stats(self, stats, name):
+        stats.dump_stats(str(self.directory / f"{name}.prof"))
+        buffer = io.StringIO()
+        stats.stream = buffer
+        stats.sort_stats('cumulative').print_stats(CONFIG['PROFILE_TOP'])
+        (self.directory / f"{name}.txt").write_text(buffer.getvalue(), encoding='utf-8')
+
+
+_profiler = None
+
+
+def start_profiling(modes, stage=None):
+    """
+    Start profiling this session; the reports are written at exit.
+
+    Args:
+        modes (list): Any of 'cpu', 'sample', 'memory' and 'browser'
+        stage (str, optional): Limit 'cpu' to calls of this stage (a @timed name)
+
+    Returns:
+        Profiler: The running profiler
+    """
+    global _profiler
+    _profiler = Profiler(modes, stage)
+    CONFIG['PROFILE_STAGE'] = stage if 'cpu' in modes else None
+    _profiler.start()
+    atexit.register(_profiler.stop)
+    return _profiler
+
+
+_nlp = None
+
+
+def get_nlp():
+    """
+    Get the spaCy pipeline, loading the model on first use.
+
+    Returns:
+        spacy.Language: The en_core_web_sm pipeline
+    """
+    global _nlp
+    if _nlp is None:
+        _nlp = spacy.load("en_core_web_sm")
+    return _nlp
 
 def validate_input(user_input):
     """
@@ -222,11 +922,56 @@ def validate_input(user_input):
         
     return True
 
+@lru_cache(maxsize=1)
+def _query_pattern():
+    """Compile the '<verb> <purpose> <preposition> <site>' grammar from CONFIG."""
+    verbs = '|'.join(map(re.escape, CONFIG['SEARCH_TERMS']))
+    prepositions = '|'.join(map(re.escape, CONFIG['PREPOSITIONS']))
+    return re.compile(
+        rf"\b(?:{verbs})\s+(?P<purpose>.*?\b(?:{prepositions})\s+(?P<site>[\w.-]+?))[\s.!?]*$",
+        re.IGNORECASE
+    )
+
+
+@lru_cache(maxsize=1)
+def _known_sites():
+    """Domains (and their bare names, e.g. 'medium') the scraper has config for."""
+    domains = set(CONFIG['SUPPORTED_SITES']) | set(CONFIG['SEARCH_SELECTORS']) | set(CONFIG['SEARCH_URL_TEMPLATES'])
+    return domains | {domain.split('.')[0] for domain in domains}
+
+
+def extract_info_fast(user_input):
+    """
+    Extract website and purpose with a precompiled pattern, without spaCy.
+    
+    Handles the common '<search term> <purpose> <preposition> <site>' form
+    when the site is a known site or looks like a domain.
+    
+    Args:
+        user_input (str): User's search query text
+        
+    Returns:
+        tuple or None: (website, purpose), or None if the query is ambiguous
+        and needs the NLP pipeline
+    """
+    match = _query_pattern().search(user_input)
+    if not match:
+        return None
+    site = match.group('site').lower().rstrip('.')
+    if site not in _known_sites() and not re.fullmatch(r'[a-z0-9-]+(\.[a-z0-9-]+)*\.[a-z]{2,}', site):
+        return None
+    return site, ' '.join(match.group('purpose').split())
+
+
 #NLP pipeline
+@lru_cache(maxsize=4096)
 def extract_info(user_input):
     """
     Extract website and purpose from user input using NLP.
     
+    Tries the rule-based fast path first and only runs spaCy (loading the
+    model on first use) when that is ambiguous. Results are memoized.
+    
     Args:
         user_input (str): User's search query text
         
@@ -235,7 +980,22 @@ def extract_info(user_input):
             - website (str): Extracted website name or None
             - purpose (str): Extracted search purpose or None
     """
-    doc = nlp(user_input)
+    fast = extract_info_fast(user_input)
+    if fast is not None:
+        return fast
+    return extract_info_from_doc(get_nlp()(user_input))
+
+
+def extract_info_from_doc(doc):
+    """
+    Extract website and purpose from an already parsed query.
+    
+    Args:
+        doc (spacy.tokens.Doc): Parsed query
+        
+    Returns:
+        tuple: (website, purpose), either of which may be None
+    """
     website = None
     purpose = None
     
@@ -248,7 +1008,7 @@ def extract_info(user_input):
     # Fallback: Try to extract website from prepositions
     if website is None:
         for token in doc:
-            if token.text.lower() in CONFIG['PREPOSITIONS']:
+            if token.text.lower() in CONFIG['PREPOSITIONS'] and token.i + 1 < len(doc):
                 website = token.nbor().text.lower()
                 break
 
@@ -261,71 +1021,354 @@ def extract_info(user_input):
             
     return website, purpose
 
-def generate_url(website):
+
+def parse_queries(queries, batch_size=None, n_process=None):
     """
-    Generate a valid URL from website name.
+    Parse many queries in bulk with nlp.pipe.
     
     Args:
-        website (str): Website name or domain
+        queries (iterable): Raw query strings
+        batch_size (int, optional): Texts per spaCy batch, defaults to NLP_BATCH_SIZE
+        n_process (int, optional): Worker processes, defaults to NLP_N_PROCESS
         
     Returns:
-        str or None: Full URL with https:// prefix or None if invalid
+        list: (query, website, purpose) tuples for the valid queries, in input order
     """
-    if not website:
-        return None
-    if "http" in website:
-        return website.lower()
-    elif "." in website:
-        return "https://" + website.lower()
-    else:
-        return "https://" + website + ".com"
+    valid = []
+    for query in queries:
+        query = query.strip()
+        if query and validate_input(query):
+            valid.append(query)
+    
+    # Rule-based fast path first; only ambiguous queries go through spaCy
+    results = {}
+    for query in valid:
+        fast = extract_info_fast(query)
+        if fast is not None:
+            results[query] = fast
+    ambiguous = list(dict.fromkeys(query for query in valid if query not in results))
+    if ambiguous:
+        docs = get_nlp().pipe(
+            ambiguous,
+            batch_size=batch_size or CONFIG['NLP_BATCH_SIZE'],
+            n_process=n_process or CONFIG['NLP_N_PROCESS']
+        )
+        for query, doc in zip(ambiguous, docs):
+            results[query] = extract_info_from_doc(doc)
+    logger.info(f"Parsed {len(valid) - len(ambiguous)} queries with the fast path, {len(ambiguous)} with spaCy")
+    return [(query, *results[query]) for query in valid]
 
 
-def find_search_bar(driver):
+def build_search_jobs(parsed):
     """
-    Finds the search bar element using Selenium after PyAutoGUI loads the page.
-        
+    Turn parsed queries into unique (website, purpose) search jobs.
+    
     Args:
-        driver (webdriver): The Selenium WebDriver instance.
+        parsed (list): (query, website, purpose) tuples from parse_queries
         
     Returns:
-        search_bar (WebElement or None): The search bar element if found, None otherwise.
+        list: Unique (website, purpose) pairs in first-seen order
     """
-    try:
-        wait = WebDriverWait(driver, CONFIG['SEARCH_BAR_WAIT_TIME'])
-        
-        # Website-specific selectors
-        SEARCH_SELECTORS = {
-            'medium.com': [
-                ".js-searchInput",
-                "[data-testid='search-input']",
-                "input[placeholder*='Search Medium']"
-            ],
-            'twitter.com': [
-                "[data-testid='SearchBox_Search_Input']",
-                "[aria-label='Search query']",
-                "input[placeholder*='Search']"
-            ],
-            'x.com': [  # Add X.com specific selectors
-                "[data-testid='SearchBox_Search_Input']",
-                "[aria-label='Search query']"
-            ],
-            'wikipedia.org': [
-                "#searchInput",
-                "#searchform input"
-            ],
-            'quora.com': [
-                ".q-input input",
-                "[placeholder*='question' i]"
-            ],
-            'generic': [
-                "input[type='search']",
-                "input[name*='search']",
-                "input[placeholder*='search' i]",
-                "input[aria-label*='search' i]",
-                ".search-input",
-                "#search"
-            ]
+    jobs = []
+    seen = set()
+    for query, website, purpose in parsed:
+        if website is None:
+            logger.warning(f"Unable to extract website from query: {query}")
+            continue
+        key = (website, (purpose or '').lower())
+        if key in seen:
+            continue
+        seen.add(key)
+        jobs.append((website, purpose))
+    return jobs
+
+
+# Checkpoints
+# Job state (queries, the frontier's URLs and unfinished media) is written to
+# CHECKPOINT_FILE every CHECKPOINT_INTERVAL seconds so --resume can continue.
+class JobCheckpoint:
+    """
+    Atomically written progress of a batch job.
+    
+    Queries are (website, purpose) jobs in one of pending, in_flight, done
+    and failed. URL states come from the crawl frontier at save time.
+    """
+
+    def __init__(self, path=None, state=None):
+        self.path = Path(path or CONFIG['CHECKPOINT_FILE'])
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.state = state or {
+            'session': CONFIG['CURRENT_SESSION_ID'],
+            'started_at': t.time(),
+            'finished': False,
+            'queries': {'pending': [], 'in_flight': [], 'done': [], 'failed': []}
+        }
+
+    @classmethod
+    def load(cls, path=None):
+        """
+        Read the last checkpoint.
+
+        Args:
+            path (str, optional): Checkpoint file, defaults to CHECKPOINT_FILE
+
+        Returns:
+            JobCheckpoint or None: The checkpoint, or None if there is none
+        """
+        path = Path(path or CONFIG['CHECKPOINT_FILE'])
+        try:
+            return cls(path, json.loads(path.read_text(encoding='utf-8')))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.error(f"Could not read checkpoint {path}: {e}")
+            return None
+
+    def add_jobs(self, jobs):
+        """Queue (website, purpose) jobs that the checkpoint doesn't know yet."""
+        with self._lock:
+            known = {tuple(job) for jobs_in_state in self.state['queries'].values() for job in jobs_in_state}
+            for job in jobs:
+                if tuple(job) not in known:
+                    self.state['queries']['pending'].append(list(job))
+                    known.add(tuple(job))
+
+    def remaining_jobs(self):
+        """Jobs that were in flight or pending, in that order."""
+        with self._lock:
+            queries = self.state['queries']
+            return [tuple(job) for job in queries['in_flight'] + queries['pending']]
+
+    def _move(self, job, target):
+        job = list(job)
+        for jobs_in_state in self.state['queries'].values():
+            if job in jobs_in_state:
+                jobs_in_state.remove(job)
+        self.state['queries'][target].append(job)
+
+    def start_job(self, job):
+        """Mark a job as running."""
+        with self._lock:
+            self._move(job, 'in_flight')
+
+    def finish_job(self, job, succeeded):
+        """Mark a job as done or failed."""
+        with self._lock:
+            self._move(job, 'done' if succeeded else 'failed')
+
+    def save(self):
+        """Write the checkpoint atomically (temporary file, fsync, rename)."""
+        with self._lock:
+            state = json.loads(json.dumps(self.state))
+        state['saved_at'] = t.time()
+        state['urls'] = get_frontier().snapshot(since=state['started_at'])
+        state['media'] = media_snapshot()
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix('.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except Exception as e:
+            logger.error(f"Could not write checkpoint: {e}")
+
+    def start(self):
+        """Save now and then every CHECKPOINT_INTERVAL seconds until close()."""
+        self.save()
+
+        def loop():
+            while not self._stop.wait(CONFIG['CHECKPOINT_INTERVAL']):
+                self.save()
+
+        self._thread = threading.Thread(target=loop, name='checkpoint', daemon=True)
+        self._thread.start()
+
+    def close(self, finished):
+        """Stop the periodic saves and write the final state."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        with self._lock:
+            self.state['finished'] = finished
+        self.save()
+
+
+def restore_checkpoint(checkpoint):
+    """
+    Put an unfinished job's URLs and media back in the queues and reuse its session.
+
+    Args:
+        checkpoint (JobCheckpoint): Checkpoint to resume
+    """
+    state = checkpoint.state
+    CONFIG['CURRENT_SESSION_ID'] = state['session']
+    urls = state.get('urls', {})
+    leftover = urls.get('in_flight', []) + urls.get('pending', [])
+    # Normally still pending in the frontier database; this covers losing it
+    get_frontier().add(leftover, stage='http' if CONFIG['HTTP_FAST_PATH'] else 'browser')
+    media = state.get('media', {}).get('pending', [])
+    if CONFIG['DOWNLOAD_MEDIA'] and media:
+        queue_media_urls(media)
+    logger.info(f"Resuming session {state['session']}: {len(checkpoint.remaining_jobs())} queries, "
+                f"{len(leftover)} URLs and {len(media)} media files left")
+
+
+def run_batch(queries, batch_size=None, n_process=None, resume=False):
+    """
+    Run many queries without any GUI prompt.
+    
+    Queries are parsed in bulk, deduplicated and handed to automate_search,
+    QUERY_CONCURRENCY at a time (each job takes a browser from the pool).
+    Progress is checkpointed; with resume, the unfinished queries, URLs and
+    media of the last checkpoint are picked up before the new queries.
+    
+    Args:
+        queries (iterable): Raw query strings
+        batch_size (int, optional): spaCy batch size
+        n_process (int, optional): spaCy worker processes
+        resume (bool): Continue the last unfinished job
+        
+    Returns:
+        dict: Counts of 'queries', 'jobs', 'succeeded' and 'failed'
+    """
+    queries = list(queries)
+    install_record_flush_handler()  # Records are saved from worker threads
+    checkpoint = None
+    if resume:
+        checkpoint = JobCheckpoint.load()
+        if checkpoint is None or checkpoint.state['finished']:
+            logger.info("No unfinished job to resume")
+            checkpoint = None
+        else:
+            restore_checkpoint(checkpoint)
+    checkpoint = checkpoint or JobCheckpoint()
+    if queries:
+        parsed_jobs = build_search_jobs(parse_queries(queries, batch_size, n_process))
+        logger.info(f"Parsed {len(queries)} queries into {len(parsed_jobs)} unique search jobs")
+        checkpoint.add_jobs(parsed_jobs)
+    jobs = checkpoint.remaining_jobs()
+    
+    def run_job(job):
+        website, purpose = job
+        url = generate_url(website)
+        logger.info(f"Searching {url} for: {purpose}")
+        checkpoint.start_job(job)
+        succeeded = automate_search(url, purpose)
+        checkpoint.finish_job(job, succeeded)
+        return succeeded
+    
+    checkpoint.start()
+    finished = False
+    try:
+        with ThreadPoolExecutor(max_workers=CONFIG['QUERY_CONCURRENCY']) as executor:
+            results = list(executor.map(run_job, jobs))
+        # URLs left over from the resumed job that no query picked up
+        if get_frontier().pending():
+            scrape_posts_concurrently([])
+        # The final batches queue their media when written, so flush first
+        flush_records()
+        drain_media()
+        finished = True
+    finally:
+        checkpoint.close(finished)
+    summary = {
+        'queries': len(queries),
+        'jobs': len(jobs),
+        'succeeded': sum(results),
+        'failed': len(results) - sum(results)
+    }
+    logger.info(f"Batch finished: {summary}")
+    return summary
+
+
+def generate_url(website):
+    """
+    Generate a valid URL from website name.
+    
+    Args:
+        website (str): Website name or domain
+        
+    Returns:
+        str or None: Full URL with https:// prefix or None if invalid
+    """
+    if not website:
+        return None
+    if "http" in website:
+        return website.lower()
+    elif "." in website:
+        return "https://" + website.lower()
+    else:
+        return "https://" + website + ".com"
+
+
+def generate_search_url(url, purpose):
+    """
+    Build the search results URL for a site with a registered template.
+    
+    Args:
+        url (str): Site URL as returned by generate_url
+        purpose (str): Search query
+        
+    Returns:
+        str or None: Results page URL, or None if the site has no template
+    """
+    if not url or not purpose:
+        return None
+    domain = urlparse(url).netloc.lower()
+    for site, template in CONFIG['SEARCH_URL_TEMPLATES'].items():
+        if domain == site or domain.endswith('.' + site):
+            return template.format(query=quote_plus(purpose))
+    return None
+
+
+@timed('find_search_bar')
+def find_search_bar(driver):
+    """
+    Finds the search bar element using Selenium after PyAutoGUI loads the page.
+        
+    Args:
+        driver (webdriver): The Selenium WebDriver instance.
+        
+    Returns:
+        search_bar (WebElement or None): The search bar element if found, None otherwise.
+    """
+    try:
+        # Website-specific selectors
+        SEARCH_SELECTORS = {
+            'medium.com': [
+                ".js-searchInput",
+                "[data-testid='search-input']",
+                "input[placeholder*='Search Medium']"
+            ],
+            'twitter.com': [
+                "[data-testid='SearchBox_Search_Input']",
+                "[aria-label='Search query']",
+                "input[placeholder*='Search']"
+            ],
+            'x.com': [  # Add X.com specific selectors
+                "[data-testid='SearchBox_Search_Input']",
+                "[aria-label='Search query']"
+            ],
+            'wikipedia.org': [
+                "#searchInput",
+                "#searchform input"
+            ],
+            'quora.com': [
+                ".q-input input",
+                "[placeholder*='question' i]"
+            ],
+            'generic': [
+                "input[type='search']",
+                "input[name*='search']",
+                "input[placeholder*='search' i]",
+                "input[aria-label*='search' i]",
+                ".search-input",
+                "#search"
+            ]
         }
 
         # Determine which selectors to try first based on URL
@@ -337,19 +1380,14 @@ def find_search_bar(driver):
                 site_specific_selectors = selectors
                 break
                 
-        # Try site-specific selectors first, then generic ones
+        # Site-specific selectors take priority over generic ones, but all of
+        # them are watched at once so the total wait is a single timeout
         all_selectors = site_specific_selectors + SEARCH_SELECTORS['generic']
         
-        for selector in all_selectors:
-            try:
-                search_bar = wait.until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                )
-                if search_bar.is_displayed() and search_bar.is_enabled():
-                    logger.info(f"Found search bar using selector: {selector}")
-                    return search_bar
-            except (TimeoutException, NoSuchElementException):
-                continue
+        search_bar, selector = race_selectors(driver, all_selectors, CONFIG['SEARCH_BAR_WAIT_TIME'])
+        if search_bar:
+            logger.info(f"Found search bar using selector: {selector}")
+            return search_bar
                 
         logger.error("No search bar found")
         return None
@@ -363,25 +1401,275 @@ def check_browser_installed():
     """
     Check if Firefox browser is installed in the specified path.
     
+    In scrape mode a firefox binary on PATH is accepted as well, so the
+    scraper can run on Linux servers.
+    
     Returns:
         bool: True if Firefox is found, False otherwise
     """
     if not os.path.exists(CONFIG['FIREFOX_PATH']):
+        if CONFIG['BROWSER_MODE'] == 'scrape' and shutil.which('firefox'):
+            return True
         logger.error("Firefox is not installed")
         return False
     return True
 
 
+# Page readiness
+# Installs a small tracker into the page on first use (fetch/XHR counter, resource
+# timing and a MutationObserver) and returns a snapshot of the page state, so each
+# readiness check costs a single WebDriver round trip.
+PAGE_STATE_SCRIPT = """
+var selectors = arguments[0] || [];
+var s = window.__smartScrapperState;
+if (!s) {
+    s = window.__smartScrapperState = {
+        inflight: 0,
+        resources: performance.getEntriesByType('resource').length,
+        lastNetwork: performance.now(),
+        lastMutation: performance.now()
+    };
+    var done = function() { s.inflight = Math.max(0, s.inflight - 1); s.lastNetwork = performance.now(); };
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function() {
+            s.inflight++; s.lastNetwork = performance.now();
+            var p = originalFetch.apply(this, arguments);
+            p.then(done, done);
+            return p;
+        };
+    }
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        s.inflight++; s.lastNetwork = performance.now();
+        this.addEventListener('loadend', done);
+        return originalSend.apply(this, arguments);
+    };
+    new MutationObserver(function() { s.lastMutation = performance.now(); })
+        .observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+var resources = performance.getEntriesByType('resource').length;
+if (resources !== s.resources) { s.resources = resources; s.lastNetwork = performance.now(); }
+var matched = null;
+for (var i = 0; i < selectors.length; i++) {
+    try {
+        if (document.querySelector(selectors[i])) { matched = selectors[i]; break; }
+    } catch (e) {}
+}
+return {
+    readyState: document.readyState,
+    inflight: s.inflight,
+    networkQuiet: (performance.now() - s.lastNetwork) / 1000,
+    domQuiet: (performance.now() - s.lastMutation) / 1000,
+    matched: matched
+};
+"""
+
+
+def get_page_state(driver, selectors=None):
+    """
+    Take a snapshot of the current page state in one round trip.
+
+    Args:
+        driver (webdriver): Selenium WebDriver instance
+        selectors (list, optional): CSS selectors to test for presence
+
+    Returns:
+        dict or None: readyState, inflight, networkQuiet, domQuiet and matched
+        selector, or None if the page could not be queried (e.g. mid-navigation)
+    """
+    try:
+        return driver.execute_script(PAGE_STATE_SCRIPT, list(selectors or []))
+    except Exception as e:
+        logger.debug(f"Page state unavailable: {e}")
+        return None
+
+
+def wait_for_page_ready(driver, timeout, selectors=None, network_idle=True, dom_settled=True):
+    """
+    Wait until the page is actually ready instead of sleeping a fixed time.
+
+    The page counts as ready once document.readyState is 'complete', one of the
+    given selectors is present (if any), there are no in-flight requests for
+    NETWORK_IDLE_TIME and the DOM has not changed for DOM_SETTLE_TIME.
+
+    Args:
+        driver (webdriver): Selenium WebDriver instance
+        timeout (float): Upper bound in seconds
+        selectors (list, optional): CSS selectors of which at least one must be present
+        network_idle (bool): Whether to wait for the network to go idle
+        dom_settled (bool): Whether to wait for DOM mutations to settle
+
+    Returns:
+        bool: True if the page became ready, False if the timeout was reached
+    """
+    deadline = t.monotonic() + timeout
+    start = t.monotonic()
+    state = None
+    while True:
+        state = get_page_state(driver, selectors)
+        if state and state['readyState'] == 'complete':
+            ready = True
+            if selectors and not state['matched']:
+                ready = False
+            if network_idle and (state['inflight'] > 0 or state['networkQuiet'] < CONFIG['NETWORK_IDLE_TIME']):
+                ready = False
+            if dom_settled and state['domQuiet'] < CONFIG['DOM_SETTLE_TIME']:
+                ready = False
+            if ready:
+                logger.info(f"Page ready after {t.monotonic() - start:.2f}s"
+                            + (f" (matched {state['matched']})" if state['matched'] else ""))
+                return True
+        if t.monotonic() >= deadline:
+            logger.warning(f"Page not ready after {timeout}s, continuing (last state: {state})")
+            return False
+        t.sleep(CONFIG['READINESS_POLL_INTERVAL'])
+
+
+def wait_for_dom_settled(driver, timeout):
+    """
+    Wait until the DOM stops changing, e.g. after a scroll triggered lazy loading.
+
+    Args:
+        driver (webdriver): Selenium WebDriver instance
+        timeout (float): Upper bound in seconds
+
+    Returns:
+        bool: True if the DOM settled, False if the timeout was reached
+    """
+    return wait_for_page_ready(driver, timeout, network_idle=False)
+
+
+def wait_for_navigation(driver, previous_url, previous_handles, timeout):
+    """
+    Wait until a click or form submission opened a new tab or changed the URL.
+
+    Args:
+        driver (webdriver): Selenium WebDriver instance
+        previous_url (str): URL before the action
+        previous_handles (list): Window handles before the action
+        timeout (float): Upper bound in seconds
+
+    Returns:
+        bool: True if navigation happened, False if the timeout was reached
+    """
+    deadline = t.monotonic() + timeout
+    while True:
+        try:
+            if len(driver.window_handles) > len(previous_handles) or driver.current_url != previous_url:
+                return True
+        except Exception as e:
+            logger.debug(f"Navigation check failed: {e}")
+        if t.monotonic() >= deadline:
+            return False
+        t.sleep(CONFIG['READINESS_POLL_INTERVAL'])
+
+
+# Watches every candidate selector at once and resolves with the first visible
+# (and optionally enabled) match. Earlier selectors win ties, so site-specific
+# selectors keep priority over generic ones.
+SELECTOR_RACE_SCRIPT = """
+var selectors = arguments[0], timeoutMs = arguments[1], requireEnabled = arguments[2];
+var callback = arguments[arguments.length - 1];
+function usable(el) {
+    var rect = el.getBoundingClientRect();
+    var style = window.getComputedStyle(el);
+    if (rect.width === 0 || rect.height === 0 || style.visibility === 'hidden' || style.display === 'none') {
+        return false;
+    }
+    return !requireEnabled || !el.disabled;
+}
+function check() {
+    for (var i = 0; i < selectors.length; i++) {
+        var nodes;
+        try { nodes = document.querySelectorAll(selectors[i]); } catch (e) { continue; }
+        for (var j = 0; j < nodes.length; j++) {
+            if (usable(nodes[j])) { return {selector: selectors[i], element: nodes[j]}; }
+        }
+    }
+    return null;
+}
+var found = check();
+if (found) { callback(found); return; }
+var finished = false, observer, timer, poll;
+function finish(result) {
+    if (finished) { return; }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    clearInterval(poll);
+    callback(result);
+}
+observer = new MutationObserver(function() { var f = check(); if (f) { finish(f); } });
+observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+// Visibility can also change through CSS transitions, which emit no mutations
+poll = setInterval(function() { var f = check(); if (f) { finish(f); } }, 250);
+timer = setTimeout(function() { finish(null); }, timeoutMs);
+"""
+
+
+def race_selectors(driver, selectors, timeout, require_enabled=True):
+    """
+    Wait for the first of several selectors to match, watching all of them at once.
+
+    Args:
+        driver (webdriver): Selenium WebDriver instance
+        selectors (list): Candidate CSS selectors in order of preference
+        timeout (float): Upper bound in seconds for the whole race
+        require_enabled (bool): Whether the match must also be enabled
+
+    Returns:
+        tuple: (element, selector) of the winning match, or (None, None) on timeout
+    """
+    selectors = list(dict.fromkeys(selectors))  # Dedupe, keep order
+    if not selectors:
+        return None, None
+    try:
+        driver.set_script_timeout(timeout + CONFIG['CONNECTION_CHECK_TIMEOUT'])
+        result = driver.execute_async_script(
+            SELECTOR_RACE_SCRIPT, selectors, int(timeout * 1000), require_enabled
+        )
+    except Exception as e:
+        logger.warning(f"Selector race failed: {e}")
+        return None, None
+    if result:
+        return result['element'], result['selector']
+    return None, None
+
+
+def get_ready_selectors(site_type, page_kind):
+    """
+    Get the selectors that indicate a page of the given kind has rendered.
+
+    Args:
+        site_type (str): Site type identifier ('medium.com', 'x.com', or 'generic')
+        page_kind (str): 'results' for search result pages, 'post' for posts
+
+    Returns:
+        list: CSS selectors, any of which signals readiness
+    """
+    if page_kind == 'results':
+        return (CONFIG['SEARCH_RESULTS_SELECTORS'].get(site_type, CONFIG['SEARCH_RESULTS_SELECTORS']['generic'])
+                + CONFIG['POST_SELECTORS'].get(site_type, []))
+    site_selectors = CONFIG['SUPPORTED_SITES'].get(site_type, {})
+    return site_selectors.get('title', []) + site_selectors.get('main_content', []) + site_selectors.get('tweet', [])
+
+
 
+@timed('open_first_post_dynamically')
 def open_first_post_dynamically(driver):
     """Opens the first post using fixed coordinates with fallback mechanisms."""
     try:
-        t.sleep(CONFIG['SEARCH_RESULTS_WAIT_TIME'])
+        site_type = get_site_specific_scraper(driver.current_url)
+        wait_for_page_ready(driver, CONFIG['SEARCH_RESULTS_WAIT_TIME'],
+                            selectors=get_ready_selectors(site_type, 'results'))
         
-        # Store current URL to detect changes
+        # Store current URL and tabs to detect changes
         original_url = driver.current_url
+        original_handles = driver.window_handles
         
-        if 'medium.com' in driver.current_url:
+        # Coordinate clicks need a visible desktop browser
+        if 'medium.com' in driver.current_url and CONFIG['BROWSER_MODE'] != 'scrape':
             logger.info("Using Medium.com fixed coordinates approach")
             
             # Move mouse to center of screen first
@@ -392,7 +1680,7 @@ def open_first_post_dynamically(driver):
             pyautogui.moveRel(-100, 50, duration=0.5)
             t.sleep(1)
             pyautogui.doubleClick()
-            t.sleep(CONFIG['TAB_LOAD_TIME'])
+            wait_for_navigation(driver, original_url, original_handles, CONFIG['TAB_LOAD_TIME'])
             
             # Check if URL changed (same tab) or new tab opened
             if len(driver.window_handles) > 1:
@@ -422,7 +1710,7 @@ def open_first_post_dynamically(driver):
                         EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
                     )
                     first_post.click()
-                    t.sleep(CONFIG['TAB_LOAD_TIME'])
+                    wait_for_navigation(driver, original_url, original_handles, CONFIG['TAB_LOAD_TIME'])
                     
                     # Check both new tab and same tab scenarios
                     if len(driver.window_handles) > 1 or driver.current_url != original_url:
@@ -449,14 +1737,16 @@ def automate_search_with_pyautogui(url, purpose):
         if not check_browser_installed():
             return False
             
-        driver = setup_firefox_driver()
+        pool = get_driver_pool()
+        driver = pool.acquire()
         if not driver:
             return False
             
+        failed = False
         try:
             # Navigate to URL and search
-            driver.get(url)
-            t.sleep(CONFIG['URL_LOAD_TIME'])
+            get_page(driver, url)
+            wait_for_page_ready(driver, CONFIG['URL_LOAD_TIME'])
             
             search_bar = find_search_bar(driver)
             if not search_bar:
@@ -466,17 +1756,21 @@ def automate_search_with_pyautogui(url, purpose):
             # Perform search
             logger.info("Starting search process...")
             search_bar.clear()
+            search_url = driver.current_url
+            search_handles = driver.window_handles
             search_bar.send_keys(purpose)
             search_bar.send_keys(Keys.RETURN)
-            t.sleep(CONFIG['SEARCH_QUERY_WAIT_TIME'])
+            wait_for_navigation(driver, search_url, search_handles, CONFIG['SEARCH_QUERY_WAIT_TIME'])
             
             # Store original URL before clicking post
             original_url = driver.current_url
             
             # Click first post and handle content scraping
             if open_first_post_dynamically(driver):
-                # Add extra wait for content load
-                t.sleep(CONFIG['POST_LOAD_TIME'] * 3)
+                # Wait for content load
+                site_type = get_site_specific_scraper(driver.current_url)
+                wait_for_page_ready(driver, CONFIG['POST_LOAD_TIME'] * 3,
+                                    selectors=get_ready_selectors(site_type, 'post'))
                 
                 # Verify URL changed and attempt scraping
                 current_url = driver.current_url
@@ -488,7 +1782,8 @@ def automate_search_with_pyautogui(url, purpose):
                         if scrape_blog_content(driver):
                             logger.info("Content scraped successfully")
                             return True
-                        t.sleep(2)  # Wait between attempts
+                        metrics.incr('scrape_retries')
+                        wait_for_dom_settled(driver, CONFIG['SCROLL_PAUSE_TIME'])  # Wait between attempts
                         
                     logger.error("Failed to scrape content after multiple attempts")
                 else:
@@ -496,9 +1791,11 @@ def automate_search_with_pyautogui(url, purpose):
             
             return False
             
+        except Exception:
+            failed = True
+            raise
         finally:
-            t.sleep(CONFIG['OPERATION_DELAY'] * 3)
-            driver.quit()
+            pool.release(driver, failed=failed)
             
     except Exception as e:
         logger.error(f"Error during automation: {e}")
@@ -516,69 +1813,310 @@ def setup_directories():
     Path(CONFIG['MEDIA_DIR']).mkdir(exist_ok=True)   # Creates 'media' directory
     return Path(CONFIG['OUTPUT_DIR'])
 
-def clean_filename(url):
+_host_semaphores = {}
+_host_semaphores_lock = threading.Lock()
+_url_locks = {}  # url -> [lock, users]
+_media_executor = None
+_media_futures = []
+_media_pending = set()  # URLs queued or downloading, for checkpoints
+_media_pending_lock = threading.Lock()
+
+
+def _host_semaphore(host):
+    """Get the semaphore limiting parallel downloads from one host."""
+    with _host_semaphores_lock:
+        if host not in _host_semaphores:
+            _host_semaphores[host] = threading.BoundedSemaphore(CONFIG['MEDIA_PER_HOST_LIMIT'])
+        return _host_semaphores[host]
+
+
+@contextmanager
+def _url_lock(url):
     """
-    Clean URL to create valid filename while preserving extension.
-    
+    Hold the lock that keeps two workers from writing the same partial file.
+
+    Locks are reference counted and dropped once no worker needs them, so long
+    runs don't keep one per media URL ever seen.
+    """
+    with _host_semaphores_lock:
+        entry = _url_locks.setdefault(url, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _host_semaphores_lock:
+            entry[1] -= 1
+            if not entry[1]:
+                del _url_locks[url]
+
+
+class MediaIndex:
+    """
+    On-disk index from media URL to the content hash it was stored under.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or CONFIG['MEDIA_INDEX_FILE']
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS media ("
+            " url TEXT PRIMARY KEY, hash TEXT NOT NULL, path TEXT NOT NULL,"
+            " media_type TEXT, size INTEGER, fetched_at TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS media_hash ON media (hash)")
+        self._conn.commit()
+
+    def lookup(self, url):
+        """
+        Get the stored file for a URL.
+
+        Returns:
+            str or None: Path relative to MEDIA_DIR, or None if the URL is unknown
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT path FROM media WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def add(self, url, content_hash, path, media_type, size):
+        """Record that a URL's content is stored at path (relative to MEDIA_DIR)."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO media VALUES (?, ?, ?, ?, ?, ?)",
+                (url, content_hash, path, media_type, size, datetime.now().isoformat())
+            )
+            self._conn.commit()
+
+
+_media_index = None
+
+
+def get_media_index():
+    """Get the shared media index, opening it on first use."""
+    global _media_index
+    if _media_index is None:
+        _media_index = MediaIndex()
+    return _media_index
+
+
+def media_extension(url, content_type=None):
+    """
+    Pick a file extension from the URL path, falling back to the Content-Type.
+
     Args:
         url (str): URL of the media file
-        
+        content_type (str, optional): Content-Type response header
+
     Returns:
-        str: Cleaned filename safe for filesystem use
+        str: Extension including the dot, '.jpg' if nothing better is known
     """
-    try:
-        # Extract filename from URL and remove invalid characters
-        parsed = urlparse(url)
-        base_name = os.path.basename(parsed.path)
-        
-        # Replace invalid characters with underscore
-        cleaned_name = re.sub(r'[\\/*?:"<>|]', '_', base_name)
-        cleaned_name = re.sub(r'[^\w\-_.]', '_', cleaned_name)
-        
-        # If no extension or invalid filename, generate hash-based name
-        if not cleaned_name or '.' not in cleaned_name:
-            ext = '.jpg'  # Default extension
-            hash_name = hashlib.md5(url.encode()).hexdigest()
-            cleaned_name = f"{hash_name}{ext}"
-            
-        return cleaned_name
-    except Exception as e:
-        logger.error(f"Error cleaning filename for {url}: {e}")
-        return hashlib.md5(url.encode()).hexdigest() + '.jpg'
+    ext = os.path.splitext(urlparse(url).path)[1].lower()
+    if re.fullmatch(r'\.[a-z0-9]{1,5}', ext):
+        return ext
+    if content_type:
+        guessed = mimetypes.guess_extension(content_type.split(';')[0].strip())
+        if guessed:
+            return guessed
+    return '.jpg'
 
-def download_media(url, media_type):
+
+def store_media_file(partial, content_hash, ext):
     """
-    Download media files with proper URL handling.
-    
+    Move a finished download into the content-addressed store.
+
+    Identical content is kept only once; a duplicate download is discarded.
+
     Args:
-        url (str): URL of the media to download
-        media_type (str): Type of media (e.g., 'image', 'video')
-        
+        partial (Path): Completed temporary file
+        content_hash (str): SHA-256 hex digest of its bytes
+        ext (str): File extension
+
     Returns:
-        str or None: Path to saved file or None if download failed
+        str: Path relative to MEDIA_DIR
     """
-    try:
-        # Clean and validate URL
-        if not url.startswith(('http://', 'https://')):
-            url = 'https:' + url if url.startswith('//') else 'https://' + url
-                
-        response = requests.get(url, stream=True)
-        if response.status_code == 200:
-            filename = clean_filename(url)
-            filepath = Path(CONFIG['MEDIA_DIR']) / f"{media_type}_{filename}"
-            
-            # Ensure media directory exists
-            Path(CONFIG['MEDIA_DIR']).mkdir(exist_ok=True)
-            
-            with open(filepath, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-            return str(filepath)
-    except Exception as e:
-        logger.error(f"Failed to download media from {url}: {e}")
+    relative = Path(content_hash[:2]) / content_hash[2:4] / f"{content_hash}{ext}"
+    target = Path(CONFIG['MEDIA_DIR']) / relative
+    if target.exists():
+        partial.unlink()
+    else:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        partial.replace(target)
+    return relative.as_posix()
+
+
+@timed('download_media')
+def download_media(url, media_type):
+    """
+    Download media files with proper URL handling.
+    
+    Files are stored by the SHA-256 of their bytes, so the same image behind
+    different URLs is kept once, and URLs already in the media index are
+    returned without touching the network. Uses the shared keep-alive
+    session, retries with exponential backoff and resumes from a .part file
+    left behind by an interrupted download.
+    
+    Args:
+        url (str): URL of the media to download
+        media_type (str): Type of media (e.g., 'image', 'video')
+        
+    Returns:
+        str or None: Path to saved file or None if download failed
+    """
+    # Clean and validate URL
+    if not url.startswith(('http://', 'https://')):
+        url = 'https:' + url if url.startswith('//') else 'https://' + url
+    
+    with _url_lock(url):
+        return _download_media(url, media_type)
+
+
+def _download_media(url, media_type):
+    """Fetch one URL into the content-addressed store, see download_media."""
+    index = get_media_index()
+    known = index.lookup(url)
+    if known and (Path(CONFIG['MEDIA_DIR']) / known).exists():
+        return str(Path(CONFIG['MEDIA_DIR']) / known)
+    
+    partial_dir = Path(CONFIG['MEDIA_DIR']) / '.partial'
+    partial_dir.mkdir(parents=True, exist_ok=True)
+    partial = partial_dir / (hashlib.md5(url.encode()).hexdigest() + '.part')
+    
+    for attempt in range(CONFIG['MEDIA_RETRIES']):
+        try:
+            with _host_semaphore(urlparse(url).netloc):
+                offset = partial.stat().st_size if partial.exists() else 0
+                headers = {'Range': f'bytes={offset}-'} if offset else {}
+                with get_http_session().get(url, stream=True, headers=headers,
+                                            timeout=CONFIG['MEDIA_TIMEOUT']) as response:
+                    content_type = response.headers.get('Content-Type')
+                    if response.status_code not in (200, 206, 416):
+                        if response.status_code != 429 and response.status_code < 500:
+                            logger.error(f"Failed to download media from {url}: HTTP {response.status_code}")
+                            return None
+                        raise requests.HTTPError(f"HTTP {response.status_code}")
+                    # Hash what we already have, then keep hashing while streaming.
+                    # A 416 means the partial file is already complete; a 200 means
+                    # the server ignored the range, so start over
+                    sha = hashlib.sha256()
+                    if response.status_code in (206, 416):
+                        with open(partial, 'rb') as f:
+                            for chunk in iter(lambda: f.read(65536), b''):
+                                sha.update(chunk)
+                    if response.status_code != 416:
+                        mode = 'ab' if response.status_code == 206 else 'wb'
+                        with open(partial, mode) as f:
+                            for chunk in response.iter_content(chunk_size=65536):
+                                if chunk:
+                                    sha.update(chunk)
+                                    f.write(chunk)
+            content_hash = sha.hexdigest()
+            size = partial.stat().st_size
+            relative = store_media_file(partial, content_hash, media_extension(url, content_type))
+            index.add(url, content_hash, relative, media_type, size)
+            metrics.incr('media_bytes', size)
+            return str(Path(CONFIG['MEDIA_DIR']) / relative)
+        except Exception as e:
+            if attempt + 1 == CONFIG['MEDIA_RETRIES']:
+                logger.error(f"Failed to download media from {url}: {e}")
+                break
+            delay = CONFIG['MEDIA_BACKOFF'] * (2 ** attempt)
+            metrics.incr('media_retries')
+            logger.warning(f"Retrying {url} in {delay:.1f}s after error: {e}")
+            t.sleep(delay)
     return None
 
+
+def guess_media_type(url):
+    """Classify a media URL as 'video' or 'image' from its extension."""
+    path = urlparse(url).path.lower()
+    return 'video' if path.endswith(('.mp4', '.webm', '.mov', '.m3u8')) else 'image'
+
+
+def queue_record_media(record):
+    """
+    Start downloading a record's media_urls in the background.
+    
+    Args:
+        record (dict): Saved record with media_urls joined by '||'
+        
+    Returns:
+        int: Number of downloads queued
+    """
+    urls = [url for url in dict.fromkeys(record.get('media_urls', '').split('||')) if url]
+    if not urls:
+        return 0
+    return queue_media_urls(urls)
+
+
+def queue_media_urls(urls):
+    """
+    Start downloading media URLs in the background.
+    
+    Args:
+        urls (list): Media URLs
+        
+    Returns:
+        int: Number of downloads queued
+    """
+    global _media_executor
+    if _media_executor is None:
+        _media_executor = ThreadPoolExecutor(max_workers=CONFIG['MEDIA_CONCURRENCY'],
+                                             thread_name_prefix='media')
+    for url in urls:
+        with _media_pending_lock:
+            _media_pending.add(url)
+        future = _media_executor.submit(download_media, url, guess_media_type(url))
+        future.add_done_callback(lambda _, url=url: _discard_pending_media(url))
+        _media_futures.append(future)
+    return len(urls)
+
+
+def _discard_pending_media(url):
+    with _media_pending_lock:
+        _media_pending.discard(url)
+
+
+def media_snapshot():
+    """
+    Describe unfinished media downloads for a checkpoint.
+    
+    Returns:
+        dict: 'pending' (queued or running URLs) and 'partial' (partial file
+        name -> bytes downloaded so far)
+    """
+    with _media_pending_lock:
+        pending = sorted(_media_pending)
+    partial_dir = Path(CONFIG['MEDIA_DIR']) / '.partial'
+    partial = {}
+    if partial_dir.is_dir():
+        for part in partial_dir.glob('*.part'):
+            try:
+                partial[part.name] = part.stat().st_size
+            except OSError:
+                continue
+    return {'pending': pending, 'partial': partial}
+
+
+def drain_media():
+    """
+    Wait for every queued media download to finish.
+    
+    Returns:
+        tuple: (downloaded, failed) counts
+    """
+    downloaded = failed = 0
+    while _media_futures:
+        if _media_futures.pop().result():
+            downloaded += 1
+        else:
+            failed += 1
+    if downloaded or failed:
+        logger.info(f"Media downloads: {downloaded} saved, {failed} failed")
+    return downloaded, failed
+
+
 def get_site_specific_scraper(url):
     """
     Determine appropriate scraper based on URL domain.
@@ -590,6 +2128,8 @@ def get_site_specific_scraper(url):
         str: Site type identifier ('medium.com', 'x.com', or 'generic')
     """
     domain = urlparse(url).netloc
+    if domain.lower() in CONFIG['SITE_ALIASES']:
+        return CONFIG['SITE_ALIASES'][domain.lower()]
     if 'medium.com' in domain:
         return 'medium.com'
     elif any(x in domain for x in ['x.com', 'twitter.com']):
@@ -614,6 +2154,269 @@ def setup_csv_file():
         logger.error(f"Failed to setup CSV file: {e}")
         return None
 
+# Batch extraction
+# Reads every field of a record in a single execute_script call instead of one
+# WebDriver round trip per element and per .text/.get_attribute.
+EXTRACTION_SCRIPT = """
+var specs = arguments[0];
+var result = {fields: {}, hits: {}, tried: {}};
+function textOf(el) { return (el.innerText || el.textContent || '').trim(); }
+function valueOf(el, mode) {
+    if (mode === 'src') {
+        var img = el.tagName === 'IMG' ? el : el.querySelector('img, video, source');
+        return img ? (img.currentSrc || img.src || img.getAttribute('src') || '') : '';
+    }
+    if (mode === 'link') {
+        var href = el.href || el.getAttribute('href');
+        return href ? textOf(el) + '|' + href : '';
+    }
+    if (mode === 'datetime') { return el.getAttribute('datetime') || textOf(el); }
+    if (mode === 'href') {
+        var anchor = el.closest('a[href]') || el.querySelector('a[href*="/status/"]') || el.querySelector('a[href]');
+        return anchor ? anchor.href : '';
+    }
+    return textOf(el);
+}
+specs.forEach(function(spec) {
+    var collected = [];
+    result.hits[spec.field] = null;
+    result.tried[spec.field] = [];
+    for (var i = 0; i < spec.selectors.length; i++) {
+        var started = performance.now();
+        var nodes;
+        try { nodes = document.querySelectorAll(spec.selectors[i]); } catch (e) { continue; }
+        var values = [];
+        for (var j = 0; j < nodes.length; j++) {
+            var value = valueOf(nodes[j], spec.mode);
+            if (value) {
+                values.push(value);
+                if (spec.single) { break; }
+            }
+        }
+        result.tried[spec.field].push([spec.selectors[i], values.length > 0, performance.now() - started]);
+        if (values.length) {
+            collected = collected.concat(values);
+            if (result.hits[spec.field] === null) { result.hits[spec.field] = spec.selectors[i]; }
+            if (!spec.union) { break; }
+        }
+    }
+    result.fields[spec.field] = collected;
+    // Dead selectors are checked for the statistics only; their values are not used
+    spec.probe.forEach(function(selector) {
+        var tried = result.tried[spec.field];
+        for (var k = 0; k < tried.length; k++) { if (tried[k][0] === selector) { return; } }
+        var started = performance.now();
+        var nodes;
+        try { nodes = document.querySelectorAll(selector); } catch (e) { return; }
+        var matched = false;
+        for (var j = 0; j < nodes.length && !matched; j++) { matched = !!valueOf(nodes[j], spec.mode); }
+        tried.push([selector, matched, performance.now() - started]);
+    });
+});
+return result;
+"""
+
+
+# Adaptive selector ordering
+# Hit/miss counts and latencies per site, field and selector are kept in SQLite;
+# selectors that have been matching are tried first and dead ones last.
+class SelectorStats:
+    """
+    Persistent per-site, per-field selector hit statistics.
+    
+    A miss only counts towards a selector's dead streak when another selector
+    found the field on the same page, so optional fields that are simply
+    absent don't mark their selectors as dead.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or CONFIG['SELECTOR_STATS_FILE']
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS selector_stats ("
+            "site TEXT NOT NULL, field TEXT NOT NULL, selector TEXT NOT NULL, "
+            "hits INTEGER NOT NULL, misses INTEGER NOT NULL, streak INTEGER NOT NULL, "
+            "total_ms REAL NOT NULL, last_hit REAL, "
+            "PRIMARY KEY (site, field, selector))"
+        )
+        self._conn.commit()
+        # Kept in memory too, since specs are compiled for every page
+        self._stats = {
+            tuple(row[:3]): list(row[3:])
+            for row in self._conn.execute("SELECT * FROM selector_stats")
+        }
+        self._pages = {}  # site -> pages compiled, for probing dead selectors
+
+    def record(self, site_type, tried):
+        """
+        Record one page's selector attempts.
+
+        Args:
+            site_type (str): Site type identifier
+            tried (dict): Field -> list of [selector, matched, milliseconds]
+        """
+        now = t.time()
+        with self._lock:
+            rows = []
+            for field, attempts in tried.items():
+                found = any(matched for _, matched, _ in attempts)
+                for selector, matched, ms in attempts:
+                    key = (site_type, field, selector)
+                    stats = self._stats.setdefault(key, [0, 0, 0, 0.0, None])
+                    if matched:
+                        if self.is_dead(stats):
+                            logger.info(f"Selector {selector!r} for {site_type} {field} matches again")
+                        stats[0] += 1
+                        stats[2] = 0
+                        stats[4] = now
+                    else:
+                        stats[1] += 1
+                        if found:
+                            stats[2] += 1
+                            if stats[2] == CONFIG['SELECTOR_DEAD_AFTER']:
+                                logger.warning(f"Selector {selector!r} for {site_type} {field} has stopped matching")
+                    stats[3] += ms or 0.0
+                    rows.append((*key, *stats))
+            self._conn.executemany("INSERT OR REPLACE INTO selector_stats VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self._conn.commit()
+
+    def is_dead(self, stats):
+        """Whether a stats row has missed too many pages in a row."""
+        return stats[2] >= CONFIG['SELECTOR_DEAD_AFTER']
+
+    def dead(self, site_type, field, selectors):
+        """List the selectors of a field that have stopped matching."""
+        with self._lock:
+            return [selector for selector in selectors
+                    if self.is_dead(self._stats.get((site_type, field, selector), (0, 0, 0)))]
+
+    def order(self, site_type, field, selectors):
+        """
+        Move dead selectors to the end, keeping the configured order otherwise.
+
+        Hit rates are not comparable between selectors: extraction stops at the
+        first match, so a fallback is only tried on pages where the selectors
+        before it missed. Only the dead streak, which counts pages where another
+        selector found the field, is used.
+
+        Args:
+            site_type (str): Site type identifier
+            field (str): Field name
+            selectors (list): Selectors in configured order
+
+        Returns:
+            list: Reordered selectors
+        """
+        dead = self.dead(site_type, field, selectors)
+        return [selector for selector in selectors if selector not in dead] + dead
+
+    def probe_due(self, site_type):
+        """
+        Count a page of a site and say whether it should probe dead selectors.
+
+        A demoted selector is otherwise only reached when everything before it
+        misses, so it could never match again and leave the dead list.
+        """
+        with self._lock:
+            self._pages[site_type] = self._pages.get(site_type, 0) + 1
+            return self._pages[site_type] % CONFIG['SELECTOR_PROBE_EVERY'] == 0
+
+    def report(self):
+        """
+        Summarize all recorded selectors.
+
+        Returns:
+            list: Dicts with site, field, selector, hits, misses, hit_rate,
+            avg_ms, last_hit and dead keys, dead selectors first
+        """
+        with self._lock:
+            rows = []
+            for (site, field, selector), stats in self._stats.items():
+                attempts = stats[0] + stats[1]
+                rows.append({
+                    'site': site, 'field': field, 'selector': selector,
+                    'hits': stats[0], 'misses': stats[1],
+                    'hit_rate': stats[0] / attempts if attempts else 0.0,
+                    'avg_ms': stats[3] / attempts if attempts else 0.0,
+                    'last_hit': datetime.fromtimestamp(stats[4]).isoformat() if stats[4] else None,
+                    'dead': self.is_dead(stats)
+                })
+        return sorted(rows, key=lambda row: (not row['dead'], row['site'], row['field'], -row['hit_rate']))
+
+
+_selector_stats = None
+
+
+def get_selector_stats():
+    """Get the shared selector statistics, opening them on first use."""
+    global _selector_stats
+    if _selector_stats is None:
+        _selector_stats = SelectorStats()
+    return _selector_stats
+
+
+def print_selector_report():
+    """Print selector hit statistics, flagging selectors that stopped matching."""
+    rows = get_selector_stats().report()
+    if not rows:
+        print("No selector statistics recorded yet")
+        return
+    print(f"{'site':<12} {'field':<15} {'hits':>6} {'misses':>6} {'rate':>6} {'avg ms':>7}  selector")
+    for row in rows:
+        flag = '  DEAD' if row['dead'] else ''
+        print(f"{row['site']:<12} {row['field']:<15} {row['hits']:>6} {row['misses']:>6} "
+              f"{row['hit_rate']:>6.0%} {row['avg_ms']:>7.2f}  {row['selector']}{flag}")
+
+
+def compile_field_specs(site_type):
+    """
+    Compile a site's selector map into extraction specs, one per CSV column.
+
+    PRIMARY_SELECTORS come first, followed by the SUPPORTED_SITES selectors for
+    the same column (renamed through FIELD_COLUMNS). With ADAPTIVE_SELECTORS,
+    selectors that have stopped matching are moved after the others, and on
+    every SELECTOR_PROBE_EVERY-th page they are also listed under 'probe': tried
+    for the statistics only, so one that matches again gets its place back.
+
+    Args:
+        site_type (str): Site type identifier ('medium.com', 'x.com', or 'generic')
+
+    Returns:
+        list: Dicts with field, selectors, probe, mode and single keys
+    """
+    selectors_by_field = {}
+    for field, selectors in CONFIG['PRIMARY_SELECTORS'].get(site_type, {}).items():
+        selectors_by_field.setdefault(field, []).extend(selectors)
+    columns = CONFIG['FIELD_COLUMNS'].get(site_type, {})
+    for key, selectors in CONFIG['SUPPORTED_SITES'].get(site_type, {}).items():
+        field = columns.get(key, key)
+        if field not in CONFIG['CSV_COLUMNS']:
+            continue
+        selectors_by_field.setdefault(field, []).extend(selectors)
+
+    stats = get_selector_stats() if CONFIG['ADAPTIVE_SELECTORS'] else None
+    probing = stats is not None and stats.probe_due(site_type)
+    specs = []
+    for field, selectors in selectors_by_field.items():
+        mode, joiner = CONFIG['FIELD_MODES'].get(field, ('text', None))
+        selectors = list(dict.fromkeys(selectors))
+        probe = []
+        if stats is not None:
+            selectors = stats.order(site_type, field, selectors)
+            if probing:
+                probe = stats.dead(site_type, field, selectors)
+        specs.append({
+            'field': field,
+            'selectors': selectors,
+            'probe': probe,
+            'mode': mode,
+            'single': joiner is None
+        })
+    return specs
+
+
 def extract_content_by_type(driver, selectors, content_type):
     """
     Extract specific type of content using multiple selectors.
@@ -626,146 +2429,550 @@ def extract_content_by_type(driver, selectors, content_type):
     Returns:
         list: Extracted content items
     """
-    content = []
     if isinstance(selectors, str):
         selectors = [selectors]
-        
-    for selector in selectors:
-        try:
-            elements = driver.find_elements(By.CSS_SELECTOR, selector)
-            if elements:
-                if content_type == 'media':
-                    for elem in elements:
-                        src = elem.get_attribute('src')
-                        if src:
-                            content.append(src)
-                elif content_type == 'embedded_links':
-                    for elem in elements:
-                        href = elem.get_attribute('href')
-                        text = elem.text
-                        if href:
-                            content.append(f"{text}|{href}")
-                else:
-                    content.extend([elem.text for elem in elements if elem.text])
-        except Exception as e:
-            logger.error(f"Error extracting {content_type}: {e}")
+    mode = {'media': 'src', 'embedded_links': 'link', 'post_links': 'href'}.get(content_type, 'text')
+    spec = {'field': content_type, 'selectors': list(selectors), 'mode': mode, 'single': False, 'union': True}
+    try:
+        result = driver.execute_script(EXTRACTION_SCRIPT, [spec])
+        return result['fields'].get(content_type, [])
+    except Exception as e:
+        logger.error(f"Error extracting {content_type}: {e}")
+        return []
+
+
+def extract_record(driver, site_type):
+    """
+    Extract all fields of the current page in one round trip.
+
+    Args:
+        driver (webdriver): Selenium WebDriver instance
+        site_type (str): Site type identifier ('medium.com', 'x.com', or 'generic')
+
+    Returns:
+        dict or None: 'fields' (field -> list of values), 'hits' (field ->
+        selector that matched or None) and 'tried' (field -> list of
+        [selector, matched, milliseconds]), or None if the script failed
+    """
+    try:
+        result = driver.execute_script(EXTRACTION_SCRIPT, compile_field_specs(site_type))
+    except Exception as e:
+        logger.error(f"Batch extraction failed: {e}")
+        return None
+    metrics.incr('selector_misses', sum(selector is None for selector in result['hits'].values()))
+    if CONFIG['ADAPTIVE_SELECTORS']:
+        get_selector_stats().record(site_type, result.get('tried', {}))
+    return result
+
+
+def build_record(url, site_type, fields, requested_url=None):
+    """
+    Turn extracted field values into a row keyed by CSV_COLUMNS.
+
+    Args:
+        url (str): URL of the scraped page
+        site_type (str): Site type identifier
+        fields (dict): Field name -> list of extracted values
+        requested_url (str, optional): URL that was asked for, if a redirect
+            changed it; kept under 'requested_url', which the sinks don't store,
+            so write_records can mark it seen too
+
+    Returns:
+        dict: Record with every CSV column present
+    """
+    content = {col: '' for col in CONFIG['CSV_COLUMNS']}
+    content.update({
+        'url': url,
+        'timestamp': datetime.now().isoformat(),
+        'site_type': site_type
+    })
+    if requested_url and requested_url != url:
+        content['requested_url'] = requested_url
+    for field, values in fields.items():
+        if field not in content or not values:
             continue
-            
+        _, joiner = CONFIG['FIELD_MODES'].get(field, ('text', None))
+        content[field] = values[0] if joiner is None else joiner.join(values)
+
+    # Prefix main content with the engagement summary
+    engagement = CONFIG['ENGAGEMENT_FIELDS'].get(site_type)
+    if engagement and content['main_content']:
+        engagement_info = [
+            f"{label}: {fields[field][0]}" for field, label in engagement if fields.get(field)
+        ]
+        engagement_info.append("\n" + "="*50 + "\n")
+        content['main_content'] = '\n'.join(engagement_info) + content['main_content']
     return content
 
-def scrape_blog_content(driver):
+
+# Storage sinks
+# Every sink takes batches of records keyed by CSV_COLUMNS; the SQLite and
+# Parquet sinks also store the session the record was scraped in.
+class CsvSink:
+    """
+    Appends records to scraped_data.csv.
+
+    Each batch's byte range is logged with its session in a sidecar file
+    (scraped_data.csv.sessions), so a session's rows can be read by seeking
+    instead of parsing the whole history.
+    """
+
+    name = 'csv'
+
+    def __init__(self, path=None):
+        self.path = Path(path or Path(CONFIG['OUTPUT_DIR']) / 'scraped_data.csv')
+        self.index_path = self.path.with_name(self.path.name + '.sessions')
+        # Synchronous writes (ASYNC_WRITES off) come from several workers at once
+        self._lock = threading.Lock()
+
+    def write_batch(self, records, fsync=False):
+        with self._lock:
+            self._write_batch(records, fsync)
+
+    def _write_batch(self, records, fsync):
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=CONFIG['CSV_COLUMNS'], extrasaction='ignore')
+        if not self.path.exists():
+            writer.writeheader()
+        header_length = len(buffer.getvalue().encode('utf-8'))
+        writer.writerows(records)
+        data = buffer.getvalue().encode('utf-8')
+        metrics.incr('csv_bytes', len(data))
+
+        with open(self.path, 'ab') as f:
+            offset = f.tell() + header_length
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        with open(self.index_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({
+                'session': CONFIG['CURRENT_SESSION_ID'],
+                'offset': offset,
+                'length': len(data) - header_length,
+                'rows': len(records)
+            }) + '\n')
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+
+    def iter_session(self, session):
+        """
+        Stream the rows written in one session using the sidecar offsets.
+
+        Args:
+            session (str): Session ID
+
+        Yields:
+            dict: Record keyed by CSV_COLUMNS
+        """
+        if not self.index_path.exists():
+            return
+        with open(self.index_path, encoding='utf-8') as index, open(self.path, 'rb') as data:
+            for line in index:
+                entry = json.loads(line)
+                if entry['session'] != session:
+                    continue
+                data.seek(entry['offset'])
+                chunk = data.read(entry['length']).decode('utf-8')
+                yield from csv.DictReader(io.StringIO(chunk, newline=''), fieldnames=CONFIG['CSV_COLUMNS'])
+
+    def iter_all(self):
+        """Stream every row in the CSV file."""
+        with open(self.path, newline='', encoding='utf-8', errors='replace') as f:
+            yield from csv.DictReader(f)
+
+    def close(self):
+        pass
+
+
+class SQLiteSink:
+    """Inserts records into an SQLite table indexed on url, timestamp and session."""
+
+    name = 'sqlite'
+
+    def __init__(self, path=None):
+        self.path = path or CONFIG['SQLITE_PATH']
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        columns = ', '.join(f'"{col}" TEXT' for col in CONFIG['CSV_COLUMNS'])
+        with self._conn:
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS records (id INTEGER PRIMARY KEY, session TEXT, {columns})")
+            for col in ('url', 'timestamp', 'session'):
+                self._conn.execute(f'CREATE INDEX IF NOT EXISTS records_{col} ON records ("{col}")')
+
+    def write_batch(self, records, fsync=False):
+        columns = ['session'] + CONFIG['CSV_COLUMNS']
+        placeholders = ', '.join('?' for _ in columns)
+        names = ', '.join(f'"{col}"' for col in columns)
+        rows = [
+            [CONFIG['CURRENT_SESSION_ID']] + [record.get(col, '') for col in CONFIG['CSV_COLUMNS']]
+            for record in records
+        ]
+        with self._lock:
+            # FULL syncs the commit to disk, NORMAL leaves it to the OS
+            self._conn.execute(f"PRAGMA synchronous = {'FULL' if fsync else 'NORMAL'}")
+            with self._conn:  # One transaction per batch
+                self._conn.executemany(f"INSERT INTO records ({names}) VALUES ({placeholders})", rows)
+
+    def iter_rows(self, where='', params=()):
+        """
+        Stream records matching a WHERE clause in insertion order.
+
+        Args:
+            where (str): SQL condition, e.g. 'session = ?'; empty for all rows
+            params (tuple): Query parameters
+
+        Yields:
+            dict: Record with session and CSV_COLUMNS keys
+        """
+        sql = "SELECT * FROM records" + (f" WHERE {where}" if where else "") + " ORDER BY id"
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            names = [d[0] for d in cursor.description]
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(100)
+            if not rows:
+                return
+            for row in rows:
+                record = dict(zip(names, row))
+                record.pop('id', None)
+                yield record
+
+    def close(self):
+        self._conn.close()
+
+
+class ParquetSink:
+    """Writes each batch as a Parquet part file for analytics (needs pyarrow)."""
+
+    name = 'parquet'
+
+    def __init__(self, directory=None):
+        # Fail once here, so get_storage_sinks skips the sink, not on every batch
+        try:
+            importlib.import_module('pyarrow')
+        except ImportError as e:
+            raise ImportError("the parquet sink needs pyarrow (pip install pyarrow)") from e
+        self.directory = Path(directory or CONFIG['PARQUET_DIR'])
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._parts = 0
+
+    def write_batch(self, records, fsync=False):
+        df = pd.DataFrame(records, columns=CONFIG['CSV_COLUMNS'])
+        df.insert(0, 'session', CONFIG['CURRENT_SESSION_ID'])
+        self._parts += 1
+        part = self.directory / f"part-{CONFIG['CURRENT_SESSION_ID']}-{os.getpid()}-{self._parts:05d}.parquet"
+        df.to_parquet(part, index=False)
+        if fsync:
+            with open(part, 'rb') as f:
+                os.fsync(f.fileno())
+
+    def close(self):
+        pass
+
+
+SINK_TYPES = {'csv': CsvSink, 'sqlite': SQLiteSink, 'parquet': ParquetSink}
+_storage_sinks = None
+
+
+def get_storage_sinks():
+    """
+    Get the configured storage sinks, opening them on first use.
+
+    Returns:
+        list: Sink instances for every name in STORAGE_SINKS
+    """
+    global _storage_sinks
+    if _storage_sinks is None:
+        _storage_sinks = []
+        for name in CONFIG['STORAGE_SINKS']:
+            try:
+                _storage_sinks.append(SINK_TYPES[name]())
+            except Exception as e:
+                logger.error(f"Could not open {name} storage sink: {e}")
+    return _storage_sinks
+
+
+def get_sink(name):
+    """Get the open sink with the given name, or None if it isn't configured."""
+    return next((sink for sink in get_storage_sinks() if sink.name == name), None)
+
+
+def write_records(records, fsync=False):
+    """
+    Write a batch of scraped records to every storage sink.
+
+    Args:
+        records (list): Records keyed by CSV_COLUMNS
+        fsync (bool): Whether to force the data to disk before returning
+
+    Returns:
+        bool: True if at least one sink stored the batch, False otherwise
+    """
+    if not records:
+        return True
+    stored = False
+    for sink in get_storage_sinks():
+        try:
+            with metrics.span(f'write_{sink.name}'):
+                sink.write_batch(records, fsync=fsync)
+            stored = True
+        except Exception as e:
+            logger.error(f"Failed to save {len(records)} records to {sink.name}: {e}")
+    if not stored:
+        return False
+
+    logger.info(f"Successfully saved {len(records)} records")
+    for content in records:
+        # The batch is stored; a bookkeeping error must not lose the rest of it
+        try:
+            # Harvested links that redirect (Medium's /p/<id>) are looked up as requested
+            for url in {content.get('url'), content.get('requested_url')} - {None, ''}:
+                get_seen_index().mark(url)
+            if CONFIG['DOWNLOAD_MEDIA']:
+                queue_record_media(content)
+        except Exception as e:
+            logger.error(f"Post-write bookkeeping failed for {content.get('url')}: {e}")
+    return True
+
+
+class RecordWriter:
+    """
+    Single background thread that writes scraped records in batches.
+
+    Scrapers hand records over through a bounded queue and return at once;
+    the thread writes a batch when WRITER_BATCH_SIZE records are pending or
+    the oldest has waited WRITER_FLUSH_INTERVAL seconds, so output from
+    concurrent workers is never interleaved.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue(maxsize=CONFIG['WRITER_QUEUE_SIZE'])
+        self._last_fsync = t.monotonic()
+        self._failed = False  # A batch failed since the last flush
+        self._thread = threading.Thread(target=self._run, name='record-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, records):
+        """Queue records for writing; blocks only while the queue is full."""
+        for record in records:
+            self._queue.put(record)
+
+    def flush(self, timeout=None):
+        """
+        Wait until every record submitted so far has been written.
+
+        Returns:
+            bool: True if flushed within the timeout and every batch since the
+            previous flush reached a sink
+        """
+        done = threading.Event()
+        done.stored = False
+        self._queue.put(done)
+        return done.wait(timeout) and done.stored
+
+    def close(self, timeout=None):
+        """Write everything that is pending and stop the thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+    def _run(self):
+        pending = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0, deadline - t.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = False  # Flush interval elapsed
+            if isinstance(item, dict):
+                pending.append(item)
+                if deadline is None:
+                    deadline = t.monotonic() + CONFIG['WRITER_FLUSH_INTERVAL']
+                if len(pending) < CONFIG['WRITER_BATCH_SIZE']:
+                    continue
+            if pending:
+                try:
+                    stored = write_records(pending, fsync=self._should_fsync())
+                except Exception as e:
+                    logger.error(f"Record writer failed on {len(pending)} records: {e}")
+                    stored = False
+                if not stored:
+                    self._failed = True
+                pending = []
+            deadline = None
+            if isinstance(item, threading.Event):
+                item.stored = not self._failed
+                self._failed = False
+                item.set()
+            elif item is None:
+                return
+
+    def _should_fsync(self):
+        policy = CONFIG['WRITER_FSYNC']
+        if policy == 'batch':
+            return True
+        if policy == 'interval' and t.monotonic() - self._last_fsync >= CONFIG['WRITER_FSYNC_INTERVAL']:
+            self._last_fsync = t.monotonic()
+            return True
+        return False
+
+
+_record_writer = None
+_writer_lock = threading.Lock()
+_sigterm_installed = False
+
+
+def install_record_flush_handler():
+    """
+    Flush the record writer on SIGTERM.
+
+    Signal handlers can only be installed from the main thread, and records
+    are usually first saved from worker threads, so main() and run_batch()
+    install this up front. Safe to call more than once.
+
+    Returns:
+        bool: True if the handler is installed
+    """
+    global _sigterm_installed
+    if _sigterm_installed:
+        return True
+    if threading.current_thread() is not threading.main_thread():
+        return False
+    previous = signal.getsignal(signal.SIGTERM)
+
+    def flush_and_exit(signum, frame):
+        writer = _record_writer
+        if writer is not None:
+            writer.close(timeout=CONFIG['WRITER_FLUSH_INTERVAL'] * 5)
+        if callable(previous):
+            previous(signum, frame)
+        raise SystemExit(128 + signum)
+
+    signal.signal(signal.SIGTERM, flush_and_exit)
+    _sigterm_installed = True
+    return True
+
+
+def get_record_writer():
+    """
+    Get the shared record writer, starting it on first use.
+
+    The writer is flushed on SIGTERM (see install_record_flush_handler) and,
+    as a last resort, at exit; the command line entry point closes it
+    explicitly with close_records().
+
+    Returns:
+        RecordWriter: Running writer
+    """
+    global _record_writer
+    with _writer_lock:
+        if _record_writer is None:
+            _record_writer = RecordWriter()
+            atexit.register(_record_writer.close)
+            install_record_flush_handler()
+        return _record_writer
+
+
+def flush_records():
+    """
+    Wait for the background writer to write everything submitted so far.
+
+    Returns:
+        bool: True if every record submitted since the last flush was stored
+    """
+    if _record_writer is None:
+        return True
+    return _record_writer.flush()
+
+
+def close_records():
+    """
+    Write everything still queued, stop the background writer and wait for the
+    media downloads its last batches started.
+
+    Call this before the interpreter shuts down: by the time atexit closes the
+    writer, the media executor no longer accepts downloads.
+    """
+    global _record_writer
+    with _writer_lock:
+        writer, _record_writer = _record_writer, None
+    if writer is not None:
+        writer.close()
+    drain_media()
+
+
+def save_records(records):
+    """
+    Save a batch of scraped records.
+
+    With ASYNC_WRITES the records are handed to the background writer and
+    this returns immediately; otherwise they are written synchronously.
+
+    Args:
+        records (list): Records keyed by CSV_COLUMNS
+
+    Returns:
+        bool: True if the records were accepted, False otherwise
+    """
+    if not CONFIG['ASYNC_WRITES']:
+        return write_records(records, fsync=CONFIG['WRITER_FSYNC'] != 'never')
+    if records:
+        get_record_writer().submit(records)
+    return True
+
+
+def save_record(content):
+    """
+    Save a single scraped record.
+
+    Args:
+        content (dict): Record keyed by CSV_COLUMNS
+
+    Returns:
+        bool: True if the record was written, False otherwise
+    """
+    return save_records([content])
+
+
+@timed('scrape_blog_content')
+def scrape_blog_content(driver, requested_url=None):
     """Scrape content from Medium blog post with engagement metrics and new selectors."""
     try:
         logger.info("Starting content scraping process...")
-        t.sleep(CONFIG['POST_LOAD_TIME'] * 2)
-        
-        # Initialize content dictionary
-        content = {col: '' for col in CONFIG['CSV_COLUMNS']}
-        content.update({
-            'url': driver.current_url,
-            'timestamp': datetime.now().isoformat(),
-            'site_type': 'medium.com'
-        })
+        url = driver.current_url
+        site_type = get_site_specific_scraper(url)
+        wait_for_page_ready(driver, CONFIG['POST_LOAD_TIME'] * 2,
+                            selectors=get_ready_selectors(site_type, 'post'))
         
-        # Scroll for dynamic content
+        # Scroll for dynamic content until the page stops growing
         logger.info("Scrolling to load full content...")
-        for _ in range(2):
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            t.sleep(2)
-        
-        wait = WebDriverWait(driver, CONFIG['POST_LOAD_TIME'])
-        
-        # Collect engagement metrics first
-        engagement_info = []
-        
-        # Author name
-        try:
-            author = driver.find_element(By.CSS_SELECTOR, 'a[data-testid="authorName"]')
-            engagement_info.append(f"Author: {author.text}")
-            content['author'] = author.text  # Also store in author field
-        except:
-            logger.warning("Could not find author name")
-            
-        # Publication name
-        try:
-            publication = driver.find_element(By.CSS_SELECTOR, 'a[data-testid="publicationName"]')
-            engagement_info.append(f"Publication: {publication.text}")
-        except:
-            logger.warning("Could not find publication name")
-            
-        # Read time
-        try:
-            read_time = driver.find_element(By.CSS_SELECTOR, 'span[data-testid="storyReadTime"]')
-            engagement_info.append(f"Read time: {read_time.text}")
-            content['read_time'] = read_time.text  # Store in read_time field
-        except:
-            logger.warning("Could not find read time")
-            
-        # Claps
-        try:
-            claps = driver.find_element(By.CSS_SELECTOR, 'button[data-testid="headerClapButton"]')
-            engagement_info.append(f"Claps: {claps.text}")
-            content['claps_likes'] = claps.text  # Store in claps_likes field
-        except:
-            logger.warning("Could not find claps count")
-            
-        # Comments
-        try:
-            comments = driver.find_element(By.CSS_SELECTOR, 'span.pw-responses-count')
-            engagement_info.append(f"Comments: {comments.text}")
-            content['replies'] = comments.text  # Store in replies field
-        except:
-            logger.warning("Could not find comments count")
-            
-        # Add separator after engagement metrics
-        engagement_info.append("\n" + "="*50 + "\n")
+        for _ in scroll_and_harvest(driver, get_ready_selectors(site_type, 'post'),
+                                    time_budget=CONFIG['POST_SCROLL_TIME_BUDGET']):
+            pass
         
-        # Extract main content
-        try:
-            paragraphs = driver.find_elements(By.CSS_SELECTOR, 'p.pw-post-body-paragraph')
-            if paragraphs:
-                article_content = '\n\n'.join([p.text for p in paragraphs if p.text.strip()])
-                # Combine engagement metrics with article content
-                content['main_content'] = '\n'.join(engagement_info) + article_content
-                logger.info(f"Found {len(paragraphs)} paragraphs using new selector")
-        except Exception as e:
-            logger.warning(f"Failed to get paragraphs: {e}")
+        extracted = extract_record(driver, site_type)
+        if not extracted:
+            return False
+        fields = extracted['fields']
+        for field, selector in extracted['hits'].items():
+            if selector is None:
+                logger.warning(f"Could not find {field}")
         
-        # Extract title
-        try:
-            title = wait.until(EC.presence_of_element_located((
-                By.CSS_SELECTOR, 'h1[data-selectable-paragraph]'
-            )))
-            content['title'] = title.text
+        content = build_record(url, site_type, fields, requested_url)
+        if fields.get('main_content'):
+            logger.info(f"Found {len(fields['main_content'])} paragraphs using {extracted['hits']['main_content']}")
+        if content['title']:
             logger.info(f"Found title: {content['title'][:50]}...")
-        except:
-            logger.warning("Could not find title")
-        
-        # Extract images
-        try:
-            images = driver.find_elements(By.CSS_SELECTOR, 'figure.paragraph-image img')
-            image_urls = [img.get_attribute('src') for img in images if img.get_attribute('src')]
-            content['media_urls'] = '||'.join(image_urls)
-            logger.info(f"Found {len(image_urls)} images")
-        except:
-            logger.warning("Could not find images")
+        logger.info(f"Found {len(fields.get('media_urls', []))} images")
         
         # Save content if meaningful data exists
         if content.get('main_content') or content.get('title'):
-            csv_path = Path(CONFIG['OUTPUT_DIR']) / 'scraped_data.csv'
-            file_exists = csv_path.exists()
-            
-            try:
-                with open(csv_path, 'a', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=CONFIG['CSV_COLUMNS'])
-                    if not file_exists:
-                        writer.writeheader()
-                    writer.writerow(content)
-                logger.info("Successfully saved content to CSV")
-                return True
-            except Exception as e:
-                logger.error(f"Failed to save to CSV: {e}")
-                return False
+            return save_record(content)
         else:
             logger.error("No meaningful content found to save")
             return False
@@ -775,6 +2982,877 @@ def scrape_blog_content(driver):
         return False
 
 
+# HTTP fast path
+# Server-rendered pages are fetched with a pooled requests.Session and parsed with
+# BeautifulSoup using the same selector specs as the browser; Selenium is only
+# used when required fields come back empty.
+SCRAPE_STATS = {'http': 0, 'selenium': 0, 'failed': 0, 'paths': {}}
+_stats_lock = threading.Lock()
+_http_session = None
+
+
+def get_http_session():
+    """
+    Get the shared keep-alive HTTP session, creating it on first use.
+
+    Returns:
+        requests.Session: Session with pooled connections and default headers
+    """
+    global _http_session
+    if _http_session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=CONFIG['HTTP_POOL_SIZE'], pool_maxsize=CONFIG['HTTP_POOL_SIZE'])
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update(CONFIG['HTTP_HEADERS'])
+        _http_session = session
+    return _http_session
+
+
+def _html_value(el, mode, base_url):
+    """Read one value from a BeautifulSoup element, mirroring EXTRACTION_SCRIPT."""
+    if mode == 'src':
+        media = el if el.name == 'img' else el.select_one('img, video, source')
+        if media is None:
+            return ''
+        src = media.get('src') or media.get('data-src') or (media.get('srcset') or '').split(' ')[0]
+        return urljoin(base_url, src) if src else ''
+    if mode == 'link':
+        href = el.get('href')
+        return f"{el.get_text(' ', strip=True)}|{urljoin(base_url, href)}" if href else ''
+    if mode == 'datetime':
+        return el.get('datetime') or el.get_text(' ', strip=True)
+    if mode == 'href':
+        anchor = el if el.name == 'a' and el.get('href') else (
+            el.find_parent('a', href=True) or el.select_one('a[href*="/status/"]') or el.select_one('a[href]'))
+        return urljoin(base_url, anchor['href']) if anchor else ''
+    return el.get_text(' ', strip=True)
+
+
+def extract_record_from_html(html, url, site_type):
+    """
+    Apply a site's selector specs to raw HTML.
+
+    Args:
+        html (str): Page source
+        url (str): URL the page was fetched from, for resolving relative links
+        site_type (str): Site type identifier ('medium.com', 'x.com', or 'generic')
+
+    Returns:
+        dict: 'fields', 'hits' and 'tried' in the same shape as extract_record
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    result = {'fields': {}, 'hits': {}, 'tried': {}}
+    for spec in compile_field_specs(site_type):
+        collected = []
+        result['hits'][spec['field']] = None
+        result['tried'][spec['field']] = tried = []
+        for selector in spec['selectors']:
+            started = t.perf_counter()
+            try:
+                elements = soup.select(selector)
+            except Exception:
+                continue
+            values = []
+            for el in elements:
+                value = _html_value(el, spec['mode'], url)
+                if value:
+                    values.append(value)
+                    if spec['single']:
+                        break
+            tried.append([selector, bool(values), (t.perf_counter() - started) * 1000])
+            if values:
+                collected = values
+                result['hits'][spec['field']] = selector
+                break
+        result['fields'][spec['field']] = collected
+        # Dead selectors are checked for the statistics only; their values are not used
+        for selector in spec['probe']:
+            if any(entry[0] == selector for entry in tried):
+                continue
+            started = t.perf_counter()
+            try:
+                elements = soup.select(selector)
+            except Exception:
+                continue
+            matched = any(_html_value(el, spec['mode'], url) for el in elements)
+            tried.append([selector, matched, (t.perf_counter() - started) * 1000])
+    metrics.incr('selector_misses', sum(selector is None for selector in result['hits'].values()))
+    return result
+
+
+def missing_required_fields(site_type, fields):
+    """
+    List the required fields that came back empty.
+
+    Args:
+        site_type (str): Site type identifier
+        fields (dict): Field name -> list of extracted values
+
+    Returns:
+        list: Names of missing required fields
+    """
+    required = CONFIG['REQUIRED_FIELDS'].get(site_type, CONFIG['REQUIRED_FIELDS']['generic'])
+    return [field for field in required if not fields.get(field)]
+
+
+def record_scrape_path(url, path):
+    """Count which path ('http', 'selenium' or 'failed') served a URL."""
+    with _stats_lock:
+        SCRAPE_STATS[path] += 1
+        metrics.incr(f'pages_{path}')
+        SCRAPE_STATS['paths'][url] = path
+    if _profiler is not None:
+        _profiler.page_done()
+
+
+@timed('http_fetch')
+def scrape_url_http(url):
+    """
+    Scrape a post without a browser.
+
+    Args:
+        url (str): Post URL
+
+    Returns:
+        dict or None: Record keyed by CSV_COLUMNS, or None if the page has to be
+        rendered by the browser (HTTP error or missing required fields)
+    """
+    try:
+        response = get_http_session().get(url, timeout=CONFIG['HTTP_TIMEOUT'])
+        if response.status_code != 200:
+            logger.info(f"HTTP fast path got status {response.status_code} for {url}")
+            return None
+        metrics.incr('http_bytes', len(response.content))
+        site_type = get_site_specific_scraper(response.url)
+        extracted = extract_record_from_html(response.text, response.url, site_type)
+        missing = missing_required_fields(site_type, extracted['fields'])
+        if missing:
+            logger.info(f"HTTP fast path missing {', '.join(missing)} for {url}, escalating")
+            return None
+        # Only pages that didn't need the browser say anything about the selectors
+        if CONFIG['ADAPTIVE_SELECTORS']:
+            get_selector_stats().record(site_type, extracted['tried'])
+        return build_record(response.url, site_type, extracted['fields'], url)
+    except Exception as e:
+        logger.warning(f"HTTP fast path failed for {url}: {e}")
+        return None
+
+
+def scrape_post_url(url, driver=None, try_http=True):
+    """
+    Scrape a post over HTTP, falling back to Selenium when that isn't enough.
+
+    Args:
+        url (str): Post URL
+        driver (webdriver, optional): Driver for the fallback, navigated in its current tab
+        try_http (bool): Whether to try the HTTP fast path first
+
+    Returns:
+        bool: True if the post was scraped and saved, False otherwise
+    """
+    if try_http and CONFIG['HTTP_FAST_PATH']:
+        content = scrape_url_http(url)
+        if content and save_record(content):
+            record_scrape_path(url, 'http')
+            return True
+
+    if driver is not None:
+        try:
+            get_page(driver, url)
+            if scrape_blog_content(driver, url):
+                record_scrape_path(url, 'selenium')
+                return True
+        except Exception as e:
+            logger.error(f"Selenium fallback failed for {url}: {e}")
+
+    record_scrape_path(url, 'failed')
+    return False
+
+
+def scrape_urls(urls):
+    """
+    Scrape a list of post URLs, starting a browser only if a page needs one.
+
+    Args:
+        urls (list): Post URLs
+
+    Returns:
+        int: Number of posts scraped
+    """
+    try:
+        return scrape_posts_concurrently(urls)
+    finally:
+        flush_records()
+        drain_media()
+        log_scrape_stats()
+
+
+# Scroll engine
+# Collects the links of every match before scrolling, so items that virtualized
+# feeds (x.com) drop from the DOM further down are not lost.
+SCROLL_HARVEST_SCRIPT = """
+var selectors = arguments[0];
+var links = [];
+var count = 0;
+selectors.forEach(function(selector) {
+    var nodes;
+    try { nodes = document.querySelectorAll(selector); } catch (e) { return; }
+    count += nodes.length;
+    for (var i = 0; i < nodes.length; i++) {
+        var el = nodes[i];
+        var anchor = el.closest('a[href]') || el.querySelector('a[href*="/status/"]') || el.querySelector('a[href]');
+        if (anchor && anchor.href) { links.push(anchor.href); }
+    }
+});
+var root = document.scrollingElement || document.body;
+window.scrollTo(0, root.scrollHeight);
+return {links: links, count: count, height: root.scrollHeight};
+"""
+
+
+def scroll_and_harvest(driver, selectors, target=None, time_budget=None):
+    """
+    Scroll the current page while new matches keep appearing, yielding new links.
+
+    Stops once target links were yielded, when a scroll adds neither height nor
+    matches (short pages stop after the first scroll), or when the time budget
+    runs out. Stopping iteration early stops the scrolling too.
+
+    Args:
+        driver (webdriver): Selenium WebDriver instance
+        selectors (list): CSS selectors of the items to watch
+        target (int, optional): Stop after this many links
+        time_budget (float, optional): Seconds to keep scrolling, defaults to SCROLL_TIME_BUDGET
+
+    Yields:
+        str: Each link the first time it is seen, in page order
+    """
+    deadline = t.monotonic() + (time_budget or CONFIG['SCROLL_TIME_BUDGET'])
+    seen = set()
+    last_height = last_count = None
+    stalls = rounds = 0
+    while True:
+        rounds += 1
+        try:
+            state = driver.execute_script(SCROLL_HARVEST_SCRIPT, selectors)
+        except Exception as e:
+            logger.error(f"Scrolling failed: {e}")
+            return
+        new_links = 0
+        for link in state['links']:
+            if link in seen:
+                continue
+            seen.add(link)
+            new_links += 1
+            yield link
+            if target and len(seen) >= target:
+                logger.info(f"Scroll target of {target} links reached after {rounds} scrolls")
+                return
+
+        if state['height'] == last_height and state['count'] <= last_count and not new_links:
+            stalls += 1
+            if stalls >= CONFIG['SCROLL_MAX_STALLS']:
+                logger.info(f"Page stopped growing after {rounds} scrolls ({len(seen)} links)")
+                return
+        else:
+            stalls = 0
+        last_height, last_count = state['height'], state['count']
+        if t.monotonic() >= deadline:
+            logger.info(f"Scroll time budget used up after {rounds} scrolls ({len(seen)} links)")
+            return
+        # Give lazy loading a chance: returns as soon as requests and the DOM are quiet
+        wait_for_page_ready(driver, CONFIG['SCROLL_PAUSE_TIME'])
+
+
+def iter_post_urls(driver, limit=None):
+    """
+    Stream post links from the current results page, scrolling for more.
+
+    Args:
+        driver (webdriver): Selenium WebDriver instance showing search results
+        limit (int, optional): Maximum number of URLs, defaults to MAX_POSTS
+
+    Yields:
+        str: Unique post URLs in page order
+    """
+    limit = limit or CONFIG['MAX_POSTS']
+    page_url = driver.current_url
+    site_type = get_site_specific_scraper(page_url)
+    pattern = CONFIG['POST_URL_PATTERNS'].get(site_type)
+    selectors = CONFIG['POST_SELECTORS'].get(site_type) or get_ready_selectors(site_type, 'results')
+
+    post_urls = set()
+    links = scroll_and_harvest(driver, selectors)
+    try:
+        for link in links:
+            url = link.split('#')[0]
+            if not url.startswith(('http://', 'https://')) or url == page_url or url in post_urls:
+                continue
+            if pattern and not re.search(pattern, urlparse(url).path):
+                continue
+            post_urls.add(url)
+            yield url
+            if len(post_urls) >= limit:
+                return
+    finally:
+        links.close()
+
+
+@timed('harvest')
+def harvest_post_urls(driver, limit=None):
+    """
+    Collect post links from the current results page.
+
+    Args:
+        driver (webdriver): Selenium WebDriver instance showing search results
+        limit (int, optional): Maximum number of URLs, defaults to MAX_POSTS
+
+    Returns:
+        list: Unique post URLs in page order
+    """
+    post_urls = list(iter_post_urls(driver, limit))
+    logger.info(f"Harvested {len(post_urls)} post URLs from results page")
+    return post_urls
+
+
+def scrape_posts_concurrently(urls, driver=None, concurrency=None):
+    """
+    Scrape several posts in parallel through the crawl frontier.
+
+    URLs are queued in the frontier together with anything left over from an
+    interrupted run. Workers then take URLs as the per-domain rate limits
+    allow: first through the HTTP fast path on a thread pool, then the ones
+    that need a browser, shared between the given driver and as many extra
+    pooled sessions as are available, one worker thread per browser.
+
+    Args:
+        urls (list): Post URLs
+        driver (webdriver, optional): Driver the caller already holds, used as one of the workers
+        concurrency (int, optional): Number of workers, defaults to SCRAPE_CONCURRENCY
+
+    Returns:
+        int: Number of posts scraped
+    """
+    concurrency = concurrency or CONFIG['SCRAPE_CONCURRENCY']
+    posts_scraped = 0
+    frontier = get_frontier()
+    frontier.add(filter_unseen_urls(urls), stage='http' if CONFIG['HTTP_FAST_PATH'] else 'browser')
+
+    if frontier.pending('http'):
+        fetched = []
+
+        def http_worker():
+            while True:
+                url = frontier.acquire('http')
+                if url is None:
+                    return
+                content = scrape_url_http(url)
+                if content:
+                    fetched.append((url, content))
+                    frontier.complete(url, 'fetched')
+                else:
+                    frontier.complete(url, 'escalate')
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for _ in range(concurrency):
+                executor.submit(http_worker)
+        # Store everything fetched over HTTP as one batch, and only call the
+        # URLs done once the writer has it on disk
+        urls = [url for url, _ in fetched]
+        if fetched and save_records([content for _, content in fetched]) and flush_records():
+            for url in urls:
+                record_scrape_path(url, 'http')
+            frontier.mark_done(urls)
+            posts_scraped += len(fetched)
+        elif fetched:
+            frontier.requeue(urls, 'browser')
+
+    if frontier.pending('browser'):
+        posts_scraped += _scrape_in_browsers(frontier, driver, concurrency)
+    return posts_scraped
+
+
+def _scrape_in_browsers(frontier, driver, concurrency):
+    """Scrape the frontier's browser stage with Selenium, one worker thread per available browser."""
+    pool = get_driver_pool()
+    pooled = []
+    while len(pooled) + (driver is not None) < min(concurrency, frontier.pending('browser')):
+        extra = pool.acquire(timeout=0, wait=False)
+        if extra is None:
+            break
+        pooled.append(extra)
+    if driver is None and not pooled:
+        extra = pool.acquire()
+        if extra is None:
+            logger.error("No browser available for the posts that need one")
+            return 0
+        pooled.append(extra)
+
+    scraped = []
+
+    def worker(worker_driver):
+        try:
+            while True:
+                if pool.worn_out(worker_driver):
+                    # The caller's browser is recycled by automate_search, which
+                    # then hands what is left to a fresh one
+                    if worker_driver is driver:
+                        return
+                    pool.release(worker_driver, pages=0)
+                    worker_driver = pool.acquire(timeout=0, wait=False)
+                    if worker_driver is None:
+                        return
+                url = frontier.acquire('browser')
+                if url is None:
+                    return
+                pool.count_pages(worker_driver)
+                # Pooled browsers haven't been logged in by the caller; no-op once done
+                if CONFIG['BROWSER_MODE'] == 'scrape':
+                    inject_cookies(worker_driver, get_site_specific_scraper(url))
+                if scrape_post_url(url, worker_driver, try_http=False):
+                    scraped.append(url)
+                    frontier.complete(url, 'fetched')
+                else:
+                    frontier.complete(url, 'failed')
+        finally:
+            if worker_driver is not None and worker_driver is not driver:
+                pool.release(worker_driver, pages=0)  # Pages are counted as they load
+
+    workers = ([driver] if driver is not None else []) + pooled
+    threads = [threading.Thread(target=worker, args=(d,), daemon=True) for d in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Records are queued as each page is scraped; the URLs are done once written
+    if not flush_records():
+        frontier.requeue(scraped, 'browser')
+        return 0
+    frontier.mark_done(scraped)
+    return len(scraped)
+
+
+def normalize_url(url):
+    """
+    Normalize a post URL so tracking variants map to the same key.
+    
+    Lowercases scheme and host, drops the fragment, a trailing slash and
+    TRACKING_PARAMS / TRACKING_PARAM_PREFIXES query parameters.
+    
+    Args:
+        url (str): URL to normalize
+        
+    Returns:
+        str: Normalized URL
+    """
+    parsed = urlparse(url.strip())
+    params = parse_qs(parsed.query, keep_blank_values=True)
+    kept = {
+        key: values for key, values in params.items()
+        if key not in CONFIG['TRACKING_PARAMS']
+        and not key.startswith(tuple(CONFIG['TRACKING_PARAM_PREFIXES']))
+    }
+    path = parsed.path.rstrip('/') or '/'
+    return parsed._replace(
+        scheme=parsed.scheme.lower(),
+        netloc=parsed.netloc.lower(),
+        path=path,
+        query=urlencode(sorted(kept.items()), doseq=True),
+        fragment=''
+    ).geturl()
+
+
+class SeenUrlIndex:
+    """
+    Persistent index of scraped URLs and when they were last scraped.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or CONFIG['SEEN_INDEX_FILE']
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS seen (url TEXT PRIMARY KEY, last_scraped REAL NOT NULL)")
+        self._conn.commit()
+
+    def is_fresh(self, url, ttl_hours=None):
+        """
+        Check whether a URL was scraped recently enough to skip.
+
+        Args:
+            url (str): URL to check
+            ttl_hours (float, optional): Re-scrape TTL; None means never re-scrape
+
+        Returns:
+            bool: True if the URL should be skipped
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT last_scraped FROM seen WHERE url = ?",
+                                     (normalize_url(url),)).fetchone()
+        if row is None:
+            return False
+        return ttl_hours is None or t.time() - row[0] < ttl_hours * 3600
+
+    def mark(self, url):
+        """Record that a URL was scraped just now."""
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO seen VALUES (?, ?)", (normalize_url(url), t.time()))
+            self._conn.commit()
+
+
+_seen_index = None
+
+
+def get_seen_index():
+    """Get the shared seen-URL index, opening it on first use."""
+    global _seen_index
+    if _seen_index is None:
+        _seen_index = SeenUrlIndex()
+    return _seen_index
+
+
+def filter_unseen_urls(urls):
+    """
+    Drop URLs that were already scraped (within RESCRAPE_TTL_HOURS) or repeat.
+    
+    Args:
+        urls (list): Candidate URLs
+        
+    Returns:
+        list: URLs that still need scraping, in their original order
+    """
+    index = get_seen_index()
+    pending = []
+    keys = set()
+    for url in urls:
+        key = normalize_url(url)
+        if key in keys:
+            continue
+        keys.add(key)
+        if index.is_fresh(url, CONFIG['RESCRAPE_TTL_HOURS']):
+            logger.info(f"Skipping already scraped URL: {url}")
+            continue
+        pending.append(url)
+    return pending
+
+
+# Crawl frontier
+# Every post URL goes through a persistent priority queue. URLs are handed out
+# per domain through token buckets and concurrency caps, site types take turns
+# according to FRONTIER_WEIGHTS, and robots.txt is checked before queueing.
+class TokenBucket:
+    """
+    Request rate limiter: holds up to burst tokens, refilled at rate per second.
+    
+    Not thread-safe; CrawlFrontier only uses it under its own lock.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = t.monotonic()
+
+    def wait_time(self):
+        """Seconds until a token is available (0 if one is available now)."""
+        now = t.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self):
+        """Use up one token; call only when wait_time() returned 0."""
+        self.tokens -= 1
+
+
+class RobotsCache:
+    """
+    robots.txt parsers per origin, fetched once per ROBOTS_TTL_HOURS.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._parsers = {}  # origin -> RobotFileParser
+
+    def get(self, url):
+        """
+        Get the robots.txt parser for a URL's origin, fetching it if needed.
+
+        Args:
+            url (str): Any URL on the site
+
+        Returns:
+            urllib.robotparser.RobotFileParser: Parsed rules
+        """
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        with self._lock:
+            cached = self._parsers.get(origin)
+        if cached and t.time() - cached.mtime() < CONFIG['ROBOTS_TTL_HOURS'] * 3600:
+            return cached
+
+        parser = urllib.robotparser.RobotFileParser(origin + '/robots.txt')
+        try:
+            response = get_http_session().get(origin + '/robots.txt', timeout=CONFIG['HTTP_TIMEOUT'])
+            if response.status_code in (401, 403):
+                parser.disallow_all = True
+            elif response.status_code >= 400:
+                parser.allow_all = True
+            else:
+                parser.parse(response.text.splitlines())
+        except Exception as e:
+            logger.warning(f"Could not fetch robots.txt for {origin}: {e}")
+            parser.allow_all = True
+        parser.modified()
+        with self._lock:
+            self._parsers[origin] = parser
+        return parser
+
+    def allowed(self, url):
+        """Whether robots.txt lets our user agent fetch the URL."""
+        return self.get(url).can_fetch(CONFIG['HTTP_HEADERS']['User-Agent'], url)
+
+    def crawl_delay(self, url):
+        """Crawl-delay robots.txt asks of our user agent, or None if not known (yet)."""
+        parsed = urlparse(url)
+        with self._lock:
+            parser = self._parsers.get(f"{parsed.scheme}://{parsed.netloc}")
+        return parser.crawl_delay(CONFIG['HTTP_HEADERS']['User-Agent']) if parser else None
+
+
+class CrawlFrontier:
+    """
+    Persistent, polite queue of URLs to scrape.
+    
+    Each URL is in a stage: 'http' for the fast path or 'browser' for Selenium.
+    States are pending, in_flight, fetched (waiting to be saved), done and
+    failed; URLs robots.txt disallows are never queued. URLs that were in
+    flight or fetched when the process stopped are pending again after a
+    restart.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or CONFIG['FRONTIER_FILE']
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._cond = threading.Condition()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS frontier ("
+            "url TEXT PRIMARY KEY, domain TEXT NOT NULL, site_type TEXT NOT NULL, "
+            "stage TEXT NOT NULL, state TEXT NOT NULL, priority REAL NOT NULL, "
+            "seq INTEGER NOT NULL, updated REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_frontier_state ON frontier(state)")
+        self._conn.execute("UPDATE frontier SET state = 'pending' WHERE state IN ('in_flight', 'fetched')")
+        self._conn.commit()
+        self.robots = RobotsCache()
+        self._queues = {}      # (stage, domain) -> heap of (priority, seq, url)
+        self._sites = {}       # domain -> site type
+        self._buckets = {}     # domain -> TokenBucket
+        self._in_flight = {}   # domain -> count
+        self._passes = {}      # site type -> stride scheduling pass
+        self._seq = 0
+        for url, domain, site_type, stage, priority, seq in self._conn.execute(
+                "SELECT url, domain, site_type, stage, priority, seq FROM frontier "
+                "WHERE state = 'pending' ORDER BY seq"):
+            self._push(url, domain, site_type, stage, priority, seq)
+        self._seq = self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM frontier").fetchone()[0]
+        if self._seq and self.pending():
+            logger.info(f"Resuming crawl frontier with {self.pending()} pending URLs")
+
+    def _push(self, url, domain, site_type, stage, priority, seq):
+        self._sites[domain] = site_type
+        heapq.heappush(self._queues.setdefault((stage, domain), []), (priority, seq, url))
+
+    def _set_state(self, urls, state, stage=None):
+        now = t.time()
+        if stage is None:
+            self._conn.executemany("UPDATE frontier SET state = ?, updated = ? WHERE url = ?",
+                                   [(state, now, url) for url in urls])
+        else:
+            self._conn.executemany("UPDATE frontier SET state = ?, stage = ?, updated = ? WHERE url = ?",
+                                   [(state, stage, now, url) for url in urls])
+        self._conn.commit()
+
+    def _bucket(self, domain, url):
+        bucket = self._buckets.get(domain)
+        if bucket is None:
+            site_type = self._sites[domain]
+            rate = CONFIG['DOMAIN_RATE'].get(site_type, CONFIG['DOMAIN_RATE']['generic'])
+            delay = self.robots.crawl_delay(url) if CONFIG['RESPECT_ROBOTS'] else None
+            if delay:
+                rate = min(rate, 1 / float(delay))
+            bucket = self._buckets[domain] = TokenBucket(rate, CONFIG['DOMAIN_BURST'])
+        return bucket
+
+    def add(self, urls, stage='http', priority=0):
+        """
+        Queue URLs that are not in the frontier yet or were finished before.
+
+        Args:
+            urls (list): URLs to queue
+            stage (str): 'http' or 'browser'
+            priority (float): Lower is scraped sooner; ties keep insertion order
+
+        Returns:
+            int: Number of URLs queued
+        """
+        candidates = []
+        for url in urls:
+            if CONFIG['RESPECT_ROBOTS'] and not self.robots.allowed(url):
+                logger.info(f"Skipping {url}: disallowed by robots.txt")
+                continue
+            candidates.append(url)
+        added = 0
+        with self._cond:
+            for url in candidates:
+                self._seq += 1
+                domain = urlparse(url).netloc.lower()
+                site_type = get_site_specific_scraper(url)
+                cursor = self._conn.execute(
+                    "INSERT INTO frontier VALUES (?, ?, ?, ?, 'pending', ?, ?, ?) "
+                    "ON CONFLICT(url) DO UPDATE SET stage = excluded.stage, state = 'pending', "
+                    "priority = excluded.priority, seq = excluded.seq, updated = excluded.updated "
+                    "WHERE frontier.state IN ('done', 'failed')",
+                    (url, domain, site_type, stage, priority, self._seq, t.time()))
+                if cursor.rowcount:
+                    self._push(url, domain, site_type, stage, priority, self._seq)
+                    added += 1
+            self._conn.commit()
+            self._cond.notify_all()
+        return added
+
+    def pending(self, stage=None):
+        """Number of URLs waiting in a stage (or in all stages)."""
+        with self._cond:
+            return sum(len(heap) for (queue_stage, _), heap in self._queues.items()
+                       if stage is None or queue_stage == stage)
+
+    def acquire(self, stage='http', timeout=None):
+        """
+        Take the next URL that may be fetched now, waiting for rate limits.
+
+        Site types take turns in proportion to FRONTIER_WEIGHTS; within a site
+        type the domain whose head URL has the best priority goes first.
+
+        Args:
+            stage (str): 'http' or 'browser'
+            timeout (float, optional): Give up after this many seconds
+
+        Returns:
+            str or None: URL to scrape (report back with complete()), or None if
+            the stage is empty or the timeout was reached
+        """
+        deadline = None if timeout is None else t.monotonic() + timeout
+        with self._cond:
+            while True:
+                wait = None
+                choices = {}
+                for (queue_stage, domain), heap in self._queues.items():
+                    if queue_stage != stage or not heap:
+                        continue
+                    if self._in_flight.get(domain, 0) >= CONFIG['DOMAIN_CONCURRENCY']:
+                        continue  # complete() will notify
+                    delay = self._bucket(domain, heap[0][2]).wait_time()
+                    if delay:
+                        wait = delay if wait is None else min(wait, delay)
+                        continue
+                    site_type = self._sites[domain]
+                    if site_type not in choices or heap[0] < self._queues[(stage, choices[site_type])][0]:
+                        choices[site_type] = domain
+                if choices:
+                    floor = min(self._passes.values(), default=0.0)
+                    site_type = min(choices, key=lambda site: (self._passes.setdefault(site, floor), site))
+                    weight = CONFIG['FRONTIER_WEIGHTS'].get(site_type, CONFIG['FRONTIER_WEIGHTS']['generic'])
+                    self._passes[site_type] += 1 / weight
+                    domain = choices[site_type]
+                    _, _, url = heapq.heappop(self._queues[(stage, domain)])
+                    self._buckets[domain].take()
+                    self._in_flight[domain] = self._in_flight.get(domain, 0) + 1
+                    self._set_state([url], 'in_flight')
+                    return url
+                if not any(heap for (queue_stage, _), heap in self._queues.items() if queue_stage == stage):
+                    return None
+                if deadline is not None:
+                    remaining = deadline - t.monotonic()
+                    if remaining <= 0:
+                        return None
+                    wait = remaining if wait is None else min(wait, remaining)
+                self._cond.wait(wait)
+
+    def complete(self, url, outcome):
+        """
+        Report the result of an acquired URL and free its domain slot.
+
+        Args:
+            url (str): URL returned by acquire()
+            outcome (str): 'done', 'failed', 'fetched' (scraped, not saved yet;
+                follow with mark_done()) or 'escalate' (queue it for the browser)
+        """
+        domain = urlparse(url).netloc.lower()
+        with self._cond:
+            self._in_flight[domain] = max(0, self._in_flight.get(domain, 0) - 1)
+            if outcome == 'escalate':
+                self.requeue([url], 'browser')
+            else:
+                self._set_state([url], outcome)
+            self._cond.notify_all()
+
+    def requeue(self, urls, stage):
+        """Queue URLs that are already in the frontier again, in the given stage."""
+        with self._cond:
+            self._set_state(urls, 'pending', stage=stage)
+            for url in urls:
+                self._seq += 1
+                domain = urlparse(url).netloc.lower()
+                self._push(url, domain, get_site_specific_scraper(url), stage, 0, self._seq)
+            self._cond.notify_all()
+
+    def mark_done(self, urls):
+        """Mark fetched URLs as done once their records are written."""
+        with self._cond:
+            self._set_state(urls, 'done')
+
+    def snapshot(self, since=0):
+        """
+        List URLs by state for a checkpoint.
+
+        Args:
+            since (float): Only include done/failed URLs updated after this time
+
+        Returns:
+            dict: 'pending', 'in_flight' (including fetched), 'done' and 'failed' URL lists
+        """
+        snapshot = {'pending': [], 'in_flight': [], 'done': [], 'failed': []}
+        with self._cond:
+            rows = self._conn.execute(
+                "SELECT url, state FROM frontier WHERE state NOT IN ('done', 'failed') OR updated >= ? ORDER BY seq",
+                (since,)).fetchall()
+        for url, state in rows:
+            snapshot['in_flight' if state == 'fetched' else state].append(url)
+        return snapshot
+
+
+_frontier = None
+_frontier_lock = threading.Lock()
+
+
+def get_frontier():
+    """Get the shared crawl frontier, opening it on first use."""
+    global _frontier
+    with _frontier_lock:
+        if _frontier is None:
+            _frontier = CrawlFrontier()
+    return _frontier
+
+
+def log_scrape_stats():
+    """Log how many URLs each scrape path served."""
+    logger.info(f"Scrape paths: {SCRAPE_STATS['http']} via HTTP, "
+                f"{SCRAPE_STATS['selenium']} via Selenium, {SCRAPE_STATS['failed']} failed")
+
+
 def wait_for_search_results(driver):
     """
     Wait for search results to be visible after navigation.
@@ -789,16 +3867,10 @@ def wait_for_search_results(driver):
         site_type = get_site_specific_scraper(driver.current_url)
         selectors = CONFIG['SEARCH_RESULTS_SELECTORS'].get(site_type, ['.searchResults', 'article'])
         
-        for selector in selectors:
-            try:
-                wait = WebDriverWait(driver, CONFIG['POST_LOAD_TIME'])
-                results = wait.until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                )
-                if results.is_displayed():
-                    return True
-            except Exception:
-                continue
+        results, selector = race_selectors(driver, selectors, CONFIG['POST_LOAD_TIME'], require_enabled=False)
+        if results:
+            logger.info(f"Search results visible using selector: {selector}")
+            return True
         return False
     except Exception as e:
         logger.error(f"Error waiting for search results: {e}")
@@ -811,6 +3883,17 @@ def navigate_and_scrape_blog_posts(driver):
         original_url = driver.current_url
         original_window = driver.current_window_handle
         
+        # Read up to MAX_POSTS post links from the results page and scrape
+        # them in parallel instead of clicking through the browser
+        site_type = get_site_specific_scraper(original_url)
+        wait_for_page_ready(driver, CONFIG['SEARCH_RESULTS_WAIT_TIME'],
+                            selectors=get_ready_selectors(site_type, 'results'))
+        post_urls = harvest_post_urls(driver, CONFIG['MAX_POSTS'])
+        if post_urls:
+            posts_scraped = scrape_posts_concurrently(post_urls, driver=driver)
+            logger.info(f"Successfully scraped {posts_scraped} of {len(post_urls)} posts")
+            return posts_scraped
+        
         if open_first_post_dynamically(driver):
             try:
                 # Check if new tab opened or URL changed in same tab
@@ -829,7 +3912,8 @@ def navigate_and_scrape_blog_posts(driver):
                     return posts_scraped
                 
                 # Wait for content to load
-                t.sleep(CONFIG['POST_LOAD_TIME'] * 2)
+                wait_for_page_ready(driver, CONFIG['POST_LOAD_TIME'] * 2,
+                                    selectors=get_ready_selectors(get_site_specific_scraper(driver.current_url), 'post'))
                 
                 # Verify connection and scrape
                 try:
@@ -860,45 +3944,82 @@ def navigate_and_scrape_blog_posts(driver):
         return posts_scraped
 
 
-def read_scraped_data():
-    """Read and display scraped data from CSV file."""
-    try:
-        csv_path = Path(CONFIG['OUTPUT_DIR']) / 'scraped_data.csv'
-        if not csv_path.exists():
-            logger.error("No scraped data found")
-            return None
+def iter_scraped_records(session=None):
+    """
+    Stream stored records, optionally only those of one session.
 
-        for encoding in ['utf-8', 'utf-8-sig', 'latin-1', 'cp1252']:
-            try:
-                df = pd.read_csv(csv_path, encoding=encoding)
-                if df.empty:
-                    logger.info("No data found in CSV file")
-                    return None
+    Uses the SQLite session index when that sink is enabled, otherwise the
+    CSV sidecar offsets, so neither reads the rest of the history.
 
-                # Convert timestamp strings to datetime objects
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
-                
-                # Get current session start time
-                session_start = datetime.now().replace(microsecond=0) - pd.Timedelta(minutes=5)
-                
-                # Filter for entries from current session only
-                current_entries = df[df['timestamp'] >= session_start]
-                
-                if current_entries.empty:
-                    logger.info("No entries found from current session")
-                    return None
-                    
-                print("\nScraped Data Summary (Current Session):")
-                print(f"Entries in current session: {len(current_entries)}")
-                print("\nCurrent session entries:")
-                print(current_entries.to_string())
-                return current_entries
-                
-            except UnicodeDecodeError:
+    Args:
+        session (str, optional): Session ID, None for every record
+
+    Yields:
+        dict: Record keyed by CSV_COLUMNS
+    """
+    sqlite_sink = get_sink('sqlite')
+    if sqlite_sink is not None:
+        if session:
+            yield from sqlite_sink.iter_rows('session = ?', (session,))
+        else:
+            yield from sqlite_sink.iter_rows()
+        return
+
+    csv_sink = get_sink('csv') or CsvSink()
+    if not csv_sink.path.exists():
+        return
+    if session:
+        yield from csv_sink.iter_session(session)
+    else:
+        yield from csv_sink.iter_all()
+
+
+def display_records(records, page_size=None, preview_chars=None):
+    """
+    Print records page by page with long fields shortened.
+
+    Pauses between pages when running in a terminal.
+
+    Args:
+        records (iterable): Records keyed by CSV_COLUMNS
+        page_size (int, optional): Records per page, defaults to DISPLAY_PAGE_SIZE
+        preview_chars (int, optional): Characters per field, defaults to DISPLAY_PREVIEW_CHARS
+
+    Returns:
+        int: Number of records displayed
+    """
+    page_size = page_size or CONFIG['DISPLAY_PAGE_SIZE']
+    preview_chars = preview_chars or CONFIG['DISPLAY_PREVIEW_CHARS']
+    shown = 0
+    for record in records:
+        if shown and shown % page_size == 0 and sys.stdin.isatty():
+            if input("-- Enter for more, q to quit -- ").strip().lower() == 'q':
+                break
+        shown += 1
+        print(f"\n[{shown}] {record.get('title') or '(untitled)'}")
+        for col in CONFIG['CSV_COLUMNS']:
+            value = ' '.join((record.get(col) or '').split())  # One line per field
+            if not value or col == 'title':
                 continue
-                
-        logger.error("Failed to read CSV with any encoding")
-        return None
+            if len(value) > preview_chars:
+                value = value[:preview_chars].rstrip() + f"... ({len(value)} chars)"
+            print(f"  {col}: {value}")
+    return shown
+
+
+def read_scraped_data():
+    """Read and display scraped data, by default only the current session's."""
+    try:
+        flush_records()
+        session = CONFIG['CURRENT_SESSION_ID'] if CONFIG['SHOW_ONLY_CURRENT_SESSION'] else None
+        label = "Current Session" if session else "All Sessions"
+        print(f"\nScraped Data Summary ({label}):")
+        shown = display_records(iter_scraped_records(session))
+        if not shown:
+            logger.info("No entries found" + (" from current session" if session else ""))
+            return None
+        print(f"\nEntries shown: {shown}")
+        return shown
         
     except Exception as e:
         logger.error(f"Error reading scraped data: {e}")
@@ -923,13 +4044,159 @@ def get_default_firefox_profile():
         logger.error(f"Specified profile not found at: {profile_path}")
         return None
 
-def setup_firefox_driver():
+def resolve_geckodriver_path(refresh=False):
+    """
+    Get the geckodriver path, resolving it through GeckoDriverManager only when
+    the cached path is missing or a refresh is requested.
+    
+    Args:
+        refresh (bool): Ignore the cache and check for a new driver
+        
+    Returns:
+        str: Path to the geckodriver executable
+    """
+    cache_file = Path(CONFIG['DRIVER_CACHE_FILE'])
+    if not refresh and cache_file.exists():
+        try:
+            cached = json.loads(cache_file.read_text(encoding='utf-8'))
+            if os.path.exists(cached['path']):
+                return cached['path']
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable driver cache: {e}")
+    
+    path = GeckoDriverManager().install()
+    tmp = cache_file.with_suffix('.tmp')
+    tmp.write_text(json.dumps({'path': path, 'resolved_at': datetime.now().isoformat()}), encoding='utf-8')
+    tmp.replace(cache_file)
+    logger.info(f"Cached geckodriver path: {path}")
+    return path
+
+
+def build_blocking_pac(hosts):
+    """
+    Build a proxy auto-config script that refuses connections to the given hosts.
+
+    Args:
+        hosts (list): Domains to block, including their subdomains
+
+    Returns:
+        str: PAC script routing blocked hosts to a closed local port
+    """
+    return (
+        "function FindProxyForURL(url, host) {"
+        f" var blocked = {json.dumps(list(hosts))};"
+        " for (var i = 0; i < blocked.length; i++) {"
+        "  if (host === blocked[i] || dnsDomainIs(host, '.' + blocked[i])) { return 'PROXY 127.0.0.1:9'; }"
+        " }"
+        " return 'DIRECT';"
+        "}"
+    )
+
+
+def build_scrape_options():
+    """
+    Build options for headless scraping with a clean, throwaway profile.
+
+    Images, media and web fonts are disabled and BLOCKED_HOSTS are refused
+    through a PAC script, which cuts bandwidth and memory per browser.
+
+    Returns:
+        FirefoxOptions: Options for a headless scraping session
+    """
+    options = FirefoxOptions()
+    if os.path.exists(CONFIG['FIREFOX_PATH']):
+        options.binary_location = CONFIG['FIREFOX_PATH']
+    options.add_argument('-headless')
+    width, height = CONFIG['HEADLESS_WINDOW_SIZE']
+    options.add_argument(f'--width={width}')
+    options.add_argument(f'--height={height}')
+
+    # Skip images, audio/video and downloadable fonts
+    options.set_preference("permissions.default.image", 2)
+    options.set_preference("media.autoplay.default", 5)
+    options.set_preference("media.mediasource.enabled", False)
+    options.set_preference("media.hls.enabled", False)
+    options.set_preference("gfx.downloadable_fonts.enabled", False)
+    options.set_preference("browser.display.use_document_fonts", 0)
+
+    # Block ads and analytics
+    options.set_preference("privacy.trackingprotection.enabled", True)
+    options.set_preference("network.proxy.type", 2)
+    options.set_preference(
+        "network.proxy.autoconfig_url",
+        "data:application/x-ns-proxy-autoconfig," + quote(build_blocking_pac(CONFIG['BLOCKED_HOSTS']))
+    )
+
+    # Keep memory per browser low
+    options.set_preference("browser.cache.disk.enable", False)
+    options.set_preference("browser.sessionhistory.max_total_viewers", 0)
+    options.set_preference("dom.ipc.processCount", 1)
+    options.set_preference("browser.tabs.remote.autostart", True)
+    return options
+
+
+_cookie_sessions = set()
+
+
+def inject_cookies(driver, site_type):
+    """
+    Log a scrape-mode browser in by injecting exported cookies for a site.
+
+    Does nothing unless the site is in LOGIN_REQUIRED_SITES, and only once per
+    browser session.
+
+    Args:
+        driver (webdriver): Selenium WebDriver instance
+        site_type (str): Site type identifier
+
+    Returns:
+        bool: True if cookies are in place (or not needed), False otherwise
+    """
+    if site_type not in CONFIG['LOGIN_REQUIRED_SITES'] or (driver.session_id, site_type) in _cookie_sessions:
+        return True
+    cookie_file = CONFIG['COOKIE_FILES'].get(site_type)
+    if not cookie_file or not os.path.exists(cookie_file):
+        logger.warning(f"No cookie file for {site_type}, continuing logged out")
+        return False
+    try:
+        with open(cookie_file, encoding='utf-8') as f:
+            cookies = json.load(f)
+        # Cookies can only be set for the domain that is currently loaded
+        get_page(driver, f"https://{site_type}/")
+        allowed = {'name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'expiry', 'sameSite'}
+        for cookie in cookies:
+            driver.add_cookie({k: v for k, v in cookie.items() if k in allowed})
+        _cookie_sessions.add((driver.session_id, site_type))
+        logger.info(f"Injected {len(cookies)} cookies for {site_type}")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to inject cookies for {site_type}: {e}")
+        return False
+
+
+@timed('setup_firefox_driver')
+def setup_firefox_driver(mode=None):
     """
     Setup Firefox WebDriver using specific profile.
     
+    Args:
+        mode (str, optional): 'profile' or 'scrape', defaults to BROWSER_MODE
+    
     Returns:
         webdriver or None: Configured Firefox WebDriver instance or None if error
     """
+    mode = mode or CONFIG['BROWSER_MODE']
+    if mode == 'scrape':
+        try:
+            logger.info("Starting headless Firefox with a throwaway profile")
+            return supervise(webdriver.Firefox(
+                service=FirefoxService(resolve_geckodriver_path()),
+                options=build_scrape_options()
+            ))
+        except Exception as e:
+            logger.error(f"Error setting up Firefox driver: {e}")
+            return None
+
     try:
         options = FirefoxOptions()
         options.binary_location = CONFIG['FIREFOX_PATH']
@@ -956,50 +4223,466 @@ def setup_firefox_driver():
         options.set_preference("privacy.clearOnShutdown.passwords", False)
         options.set_preference("signon.rememberSignons", True)
         
-        service = FirefoxService(GeckoDriverManager().install())
+        service = FirefoxService(resolve_geckodriver_path())
         
         logger.info("Starting Firefox with specific profile")
         driver = webdriver.Firefox(
             service=service,
             options=options
         )
-        return driver
+        return supervise(driver)
         
     except Exception as e:
         logger.error(f"Error setting up Firefox driver: {e}")
         return None
 
+# Browser supervision
+# Every browser we start is tracked as the exact process tree under its
+# geckodriver (pid + create time, so reused pids are never mistaken for ours)
+# and listed in a per-process pidfile. Cleanup only ever kills those processes;
+# pidfiles left by crashed runs are reaped at startup.
+class BrowserSupervisor:
+    """
+    Process trees of the browsers started by this process.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = Path(directory or CONFIG['BROWSER_PIDFILE_DIR'])
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._roots = {}  # driver -> geckodriver pid
+        self._trees = {}  # driver -> {pid: (create_time, name)}
+        me = psutil.Process()
+        self.owner = {'pid': me.pid, 'create_time': me.create_time()}
+        self.pidfile = self.directory / f"{me.pid}.json"
+        self.reap_orphans()
+
+    @staticmethod
+    def _matches(pid, create_time):
+        """Get the process if pid still refers to the same process, else None."""
+        try:
+            proc = psutil.Process(pid)
+            return proc if abs(proc.create_time() - create_time) < 0.01 else None
+        except psutil.Error:
+            return None
+
+    def _save(self):
+        processes = [
+            {'pid': pid, 'create_time': create_time, 'name': name}
+            for tree in self._trees.values() for pid, (create_time, name) in tree.items()
+        ]
+        if not processes:
+            self.pidfile.unlink(missing_ok=True)
+            return
+        tmp = self.pidfile.with_suffix('.tmp')
+        tmp.write_text(json.dumps({'owner': self.owner, 'processes': processes}), encoding='utf-8')
+        tmp.replace(self.pidfile)
+
+    def register(self, driver):
+        """
+        Start tracking a new driver's geckodriver and browser processes.
+
+        Args:
+            driver (webdriver): Driver returned by webdriver.Firefox
+
+        Returns:
+            webdriver: The same driver
+        """
+        try:
+            root = driver.service.process.pid
+        except AttributeError:
+            logger.warning("Driver has no local service process, it won't be supervised")
+            return driver
+        with self._lock:
+            self._roots[driver] = root
+            self._trees[driver] = {}
+        self.processes(driver)
+        return driver
+
+    def processes(self, driver):
+        """
+        Get the live processes of a driver's tree, picking up new children.
+
+        Args:
+            driver (webdriver): Registered driver
+
+        Returns:
+            list: psutil.Process objects
+        """
+        with self._lock:
+            if driver not in self._trees:
+                return []
+            tree = self._trees[driver]
+            known = len(tree)
+            live = {}
+            for pid, (create_time, _) in tree.items():
+                proc = self._matches(pid, create_time)
+                if proc is not None:
+                    live[pid] = proc
+            try:
+                root = live.get(self._roots[driver]) or (psutil.Process(self._roots[driver]) if not tree else None)
+                for proc in ([root] + root.children(recursive=True)) if root else []:
+                    if proc.pid not in tree:
+                        tree[proc.pid] = (proc.create_time(), proc.name())
+                        live[proc.pid] = proc
+            except psutil.Error:
+                pass  # The tree changed while we walked it; what we have is still ours
+            if len(tree) != known:
+                self._save()
+            return list(live.values())
+
+    def rss_mb(self, driver):
+        """Combined resident memory of a driver's processes, in MB."""
+        total = 0
+        for proc in self.processes(driver):
+            try:
+                total += proc.memory_info().rss
+            except psutil.Error:
+                continue
+        return total / (1024 * 1024)
+
+    def terminate(self, driver):
+        """
+        Stop whatever is left of a driver's process tree and forget it.
+
+        Args:
+            driver (webdriver): Registered driver, normally after driver.quit()
+
+        Returns:
+            int: Number of processes that had to be stopped
+        """
+        procs = self.processes(driver)
+        self._stop(procs)
+        with self._lock:
+            self._roots.pop(driver, None)
+            self._trees.pop(driver, None)
+            self._save()
+        if procs:
+            logger.warning(f"Stopped {len(procs)} leftover browser processes")
+        return len(procs)
+
+    @staticmethod
+    def _stop(procs):
+        for proc in procs:
+            try:
+                proc.terminate()
+            except psutil.Error:
+                pass
+        _, alive = psutil.wait_procs(procs, timeout=CONFIG['PROCESS_CLEANUP_TIMEOUT'])
+        for proc in alive:
+            try:
+                proc.kill()
+            except psutil.Error:
+                pass
+
+    def reap_orphans(self):
+        """
+        Stop browsers listed in pidfiles whose owning process is gone.
+
+        Only processes that still match the recorded pid, create time and a
+        browser/driver name are touched.
+
+        Returns:
+            int: Number of processes stopped
+        """
+        names = [name.lower() for name in CONFIG['FIREFOX_PROCESS_NAMES']] + ['geckodriver']
+        reaped = 0
+        for pidfile in self.directory.glob('*.json'):
+            try:
+                data = json.loads(pidfile.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                continue
+            owner = data.get('owner', {})
+            if owner == self.owner or self._matches(owner.get('pid', -1), owner.get('create_time', 0)):
+                continue  # Still running (or us)
+            procs = []
+            for entry in data.get('processes', []):
+                proc = self._matches(entry['pid'], entry['create_time'])
+                if proc is not None and any(name in entry['name'].lower() for name in names):
+                    procs.append(proc)
+            self._stop(procs)
+            reaped += len(procs)
+            pidfile.unlink(missing_ok=True)
+        if reaped:
+            logger.warning(f"Reaped {reaped} browser processes left behind by a crashed run")
+            metrics.incr('orphans_reaped', reaped)
+        return reaped
+
+
+_browser_supervisor = None
+_browser_supervisor_lock = threading.Lock()
+
+
+def get_browser_supervisor():
+    """
+    Get the shared browser supervisor, creating it (and reaping orphans) on first use.
+
+    Returns:
+        BrowserSupervisor or None: None if psutil is not available
+    """
+    global _browser_supervisor
+    with _browser_supervisor_lock:
+        if _browser_supervisor is None:
+            try:
+                _browser_supervisor = BrowserSupervisor()
+            except ImportError as e:
+                logger.warning(f"Browser supervision disabled: {e}")
+                return None
+    return _browser_supervisor
+
+
+def supervise(driver):
+    """Register a freshly started driver with the supervisor, if there is one."""
+    supervisor = get_browser_supervisor()
+    return supervisor.register(driver) if supervisor else driver
+
+
+def quit_driver(driver):
+    """
+    Quit a driver, then stop whatever is left of its own process tree.
+
+    Args:
+        driver (webdriver): Selenium WebDriver instance
+    """
+    try:
+        driver.quit()
+    except Exception as e:
+        logger.error(f"Error closing driver: {e}")
+    supervisor = get_browser_supervisor()
+    if supervisor:
+        try:
+            supervisor.terminate(driver)
+        except Exception as e:
+            logger.error(f"Error stopping browser processes: {e}")
+
+
+def reset_driver_state(driver):
+    """
+    Return a driver to a clean state between jobs.
+
+    Closes every window except the first one and navigates it to about:blank.
+
+    Args:
+        driver (webdriver): Selenium WebDriver instance
+
+    Returns:
+        bool: True if the driver is usable again, False otherwise
+    """
+    try:
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.get('about:blank')
+        return True
+    except Exception as e:
+        logger.warning(f"Could not reset driver state: {e}")
+        return False
+
+
+class DriverPool:
+    """
+    Keeps up to DRIVER_POOL_SIZE warm Firefox sessions and hands them out per job.
+
+    Sessions are reset between jobs and recycled after DRIVER_MAX_PAGES pages,
+    when their processes use more than BROWSER_RSS_LIMIT_MB or when a job
+    fails, so the startup cost is only paid once per session.
+    """
+
+    def __init__(self, size=None, max_pages=None, factory=None):
+        self.size = size or CONFIG['DRIVER_POOL_SIZE']
+        self.max_pages = max_pages or CONFIG['DRIVER_MAX_PAGES']
+        self.factory = factory or setup_firefox_driver
+        self._idle = queue.LifoQueue()  # Most recently used first, it's the warmest
+        self._pages = {}
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout=None, wait=True):
+        """
+        Get a driver, starting a new one if the pool isn't full yet.
+
+        Args:
+            timeout (float, optional): Seconds to wait for a driver to be released
+            wait (bool): Whether to wait at all when the pool is exhausted
+
+        Returns:
+            webdriver or None: Driver for exclusive use until release()
+        """
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+        if can_create:
+            driver = self.factory()
+            if driver is None:
+                with self._lock:
+                    self._created -= 1
+                return None
+            self._pages[driver] = 0
+            return driver
+
+        if not wait:
+            return None
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            logger.error("Timed out waiting for a browser from the pool")
+            return None
+
+    def release(self, driver, failed=False, pages=1):
+        """
+        Return a driver to the pool, recycling it if it's worn out or broken.
+
+        Args:
+            driver (webdriver): Driver obtained from acquire()
+            failed (bool): Whether the job errored
+            pages (int): Number of pages the job loaded
+        """
+        self._pages[driver] = self._pages.get(driver, 0) + pages
+        reason = 'job failed' if failed else self.worn_out(driver)
+        if reason is None and not reset_driver_state(driver):
+            reason = 'reset failed'
+        if reason:
+            logger.info(f"Recycling browser after {self._pages[driver]} pages ({reason})")
+            metrics.incr('browsers_recycled')
+            self._discard(driver)
+            return
+        self._idle.put(driver)
+
+    def count_pages(self, driver, pages=1):
+        """Count pages a driver has loaded before it is released, so worn_out() sees them."""
+        with self._lock:
+            self._pages[driver] = self._pages.get(driver, 0) + pages
+
+    def worn_out(self, driver, pages=0):
+        """
+        Check whether a driver should be recycled.
+
+        Args:
+            driver (webdriver): Driver obtained from acquire()
+            pages (int): Pages loaded since acquire() that release() hasn't counted yet
+
+        Returns:
+            str or None: The reason, or None if the driver can keep going
+        """
+        total = self._pages.get(driver, 0) + pages
+        if total >= self.max_pages:
+            return f"{total} pages"
+        supervisor = get_browser_supervisor()
+        if supervisor:
+            rss = supervisor.rss_mb(driver)
+            if rss > CONFIG['BROWSER_RSS_LIMIT_MB']:
+                return f"{rss:.0f} MB RSS"
+        return None
+
+    @contextmanager
+    def session(self, timeout=None):
+        """
+        Context manager around acquire()/release(); marks the driver failed on exceptions.
+
+        Yields:
+            webdriver or None: Driver for the duration of the block
+        """
+        driver = self.acquire(timeout)
+        failed = False
+        try:
+            yield driver
+        except Exception:
+            failed = True
+            raise
+        finally:
+            if driver is not None:
+                self.release(driver, failed=failed)
+
+    def _discard(self, driver):
+        self._pages.pop(driver, None)
+        with self._lock:
+            self._created -= 1
+        quit_driver(driver)
+
+    def close(self):
+        """Quit every idle driver."""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+
+
+_driver_pool = None
+
+
+def get_driver_pool():
+    """
+    Get the shared driver pool, creating it on first use.
+
+    Returns:
+        DriverPool: Pool that is closed automatically at exit
+    """
+    global _driver_pool
+    if _driver_pool is None:
+        _driver_pool = DriverPool()
+        atexit.register(_driver_pool.close)
+    return _driver_pool
+
+
+@timed('query')
 def automate_search(url, purpose):
     """
     Automate search process using Selenium WebDriver.
     """
     driver = None
+    failed = False
+    pool = get_driver_pool()
     try:
         if not check_browser_installed():
             return False
             
-        driver = setup_firefox_driver()
+        driver = pool.acquire()
         if not driver:
             return False
             
-        # Navigate to URL
-        driver.get(url)
-        t.sleep(CONFIG['URL_LOAD_TIME'])
+        if CONFIG['BROWSER_MODE'] == 'scrape':
+            inject_cookies(driver, get_site_specific_scraper(url))
+            
+        # Go straight to the results page when the site has a search URL template
+        search_url = generate_search_url(url, purpose)
+        if search_url:
+            logger.info(f"Opening search results directly: {search_url}")
+            get_page(driver, search_url)
+            posts_scraped = navigate_and_scrape_blog_posts(driver)
+            logger.info(f"Successfully scraped {posts_scraped} posts")
+            log_scrape_stats()
+            return True
+            
+        # Unknown site: navigate to URL and use its search bar
+        get_page(driver, url)
+        wait_for_page_ready(driver, CONFIG['URL_LOAD_TIME'])
         
         search_bar = find_search_bar(driver)
         if search_bar:
             logger.info("Starting search process...")
-            t.sleep(CONFIG['OPERATION_DELAY'])
             
             search_bar.clear()
             search_bar.send_keys(purpose)
             t.sleep(CONFIG['INPUT_DELAY'])
+            search_url = driver.current_url
+            search_handles = driver.window_handles
             search_bar.send_keys(Keys.RETURN)
             
-            t.sleep(CONFIG['SEARCH_QUERY_WAIT_TIME'])
+            wait_for_navigation(driver, search_url, search_handles, CONFIG['SEARCH_QUERY_WAIT_TIME'])
             
             posts_scraped = navigate_and_scrape_blog_posts(driver)
             logger.info(f"Successfully scraped {posts_scraped} posts")
+            log_scrape_stats()
             return True
         else:
             logger.error("Could not find search bar")
@@ -1007,25 +4690,122 @@ def automate_search(url, purpose):
             
     except Exception as e:
         logger.error(f"An error occurred during automation: {e}")
+        failed = True
         return False
         
     finally:
         if driver:
-            try:
-                t.sleep(CONFIG['OPERATION_DELAY'])
-                driver.quit()
-            except Exception as e:
-                logger.error(f"Error closing driver: {e}")
-                # Force close any remaining Firefox processes if needed
-                try:
-                    for proc in psutil.process_iter(['pid', 'name']):
-                        if 'firefox' in proc.info['name'].lower():
-                            proc.kill()
-                except Exception:
-                    pass
+            pool.release(driver, failed=failed)
+            # Posts left over by a browser that wore out mid-query get a fresh one
+            if not failed and get_frontier().pending('browser'):
+                scrape_posts_concurrently([])
+        flush_records()
+        drain_media()
+
+def measure_startup(runs=5):
+    """
+    Measure how long importing this module takes, in fresh interpreters.
+    
+    Args:
+        runs (int): Number of interpreter starts to average
+        
+    Returns:
+        float: Mean import time in seconds
+    """
+    code = "import time; s = time.perf_counter(); import au; print(time.perf_counter() - s)"
+    timings = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-c', code], cwd=BASE_DIR,
+                             capture_output=True, text=True, check=True)
+        timings.append(float(out.stdout.strip().splitlines()[-1]))
+    mean = sum(timings) / len(timings)
+    print(f"import au: {mean * 1000:.1f} ms (mean of {runs}, min {min(timings) * 1000:.1f} ms)")
+    return mean
+
+
+def parse_args(argv=None):
+    """
+    Parse command line arguments.
+    
+    Args:
+        argv (list, optional): Arguments, defaults to sys.argv[1:]
+        
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Search a site and scrape the resulting posts.")
+    parser.add_argument('--refresh-driver', action='store_true',
+                        help="re-resolve geckodriver (checks for updates) and update the cached path")
+    parser.add_argument('--validate', metavar='QUERY',
+                        help="only check that QUERY is a valid input and exit")
+    parser.add_argument('--measure-startup', action='store_true',
+                        help="report how long importing au.py takes and exit")
+    parser.add_argument('--selector-report', action='store_true',
+                        help="show selector hit statistics, flagging dead selectors, and exit")
+    parser.add_argument('--query', action='append', default=[],
+                        help="run this query without the GUI prompt (repeatable)")
+    parser.add_argument('--queries', metavar='FILE',
+                        help="run one query per line from FILE ('-' for stdin)")
+    parser.add_argument('--metrics', action='store_true',
+                        help="record stage timings and counters, written to METRICS_DIR at exit")
+    parser.add_argument('--metrics-port', type=int, metavar='PORT',
+                        help="with --metrics, also serve them on http://127.0.0.1:PORT/metrics")
+    parser.add_argument('--profile', action='append', choices=['cpu', 'sample', 'memory', 'browser'],
+                        help="profile the run (repeatable): cProfile, stack sampling of all threads, "
+                             "tracemalloc diffs between pages or browser process RSS")
+    parser.add_argument('--profile-stage', metavar='STAGE',
+                        help="with --profile cpu, only profile calls of this stage "
+                             "(e.g. scrape_blog_content, http_fetch, query)")
+    parser.add_argument('--resume', action='store_true',
+                        help="continue the last unfinished batch job (queries, URLs and media)")
+    parser.add_argument('--batch-size', type=int,
+                        help=f"queries per nlp.pipe batch (default {CONFIG['NLP_BATCH_SIZE']})")
+    parser.add_argument('--n-process', type=int,
+                        help=f"spaCy worker processes (default {CONFIG['NLP_N_PROCESS']})")
+    return parser.parse_args(argv)
+
+
+def read_query_file(path):
+    """
+    Read queries, one per line, from a file or '-' for stdin.
+    
+    Args:
+        path (str): File path or '-'
+        
+    Returns:
+        list: Non-empty lines
+    """
+    if path == '-':
+        return [line.strip() for line in sys.stdin if line.strip()]
+    with open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
 
-def main():
+def main(argv=None):
     """Main execution function with proper timing controls"""
+    args = parse_args(argv)
+    install_record_flush_handler()
+    if args.metrics:
+        enable_metrics(args.metrics_port)
+    if args.profile:
+        start_profiling(args.profile, args.profile_stage)
+    if args.measure_startup:
+        measure_startup()
+        return True
+    if args.validate is not None:
+        return validate_input(args.validate)
+    if args.refresh_driver:
+        print(resolve_geckodriver_path(refresh=True))
+        return True
+    if args.selector_report:
+        print_selector_report()
+        return True
+    if args.query or args.queries or args.resume:
+        setup_directories()
+        queries = args.query + (read_query_file(args.queries) if args.queries else [])
+        summary = run_batch(queries, args.batch_size, args.n_process, resume=args.resume)
+        return summary['failed'] == 0 and (summary['jobs'] > 0 or args.resume)
+    
     try:
         # Initial setup
         setup_directories()
@@ -1074,4 +4854,8 @@ def main():
         logger.info("Process completed")
 
 if __name__ == "__main__":
-    main()
+    try:
+        success = main()
+    finally:
+        close_records()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,376 @@
+"""
+Offline benchmark for the scraping pipeline.
+
+Serves synthetic Medium- and X-like pages from local HTTP servers, with the
+markup au.py's selectors expect, optional latency and scroll-loaded result
+feeds, then drives the real pipeline against them and reports throughput,
+per-stage latency (from au.metrics), counters and bytes served as JSON.
+
+    python benchmark.py --queries 3 --posts 20 --latency 50 --output run.json
+    python benchmark.py --http-only --posts 200
+"""
+
+# Standard library imports
+import os
+import sys
+import json
+import time as t
+import random
+import hashlib
+import logging
+import argparse
+import tempfile
+import threading
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, quote
+
+import au
+
+logger = logging.getLogger('benchmark')
+
+WORDS = ('scraper browser latency python selenium medium thread queue record '
+         'pipeline cache socket parser feed token buffer index session').split()
+
+# A 1x1 PNG, padded to the requested image size
+PNG_PIXEL = bytes.fromhex(
+    '89504e470d0a1a0a0000000d4948445200000001000000010806000000'
+    '1f15c4890000000d49444154789c6360000002000001e221bc330000000049454e44ae426082'
+)
+
+
+def words(seed, count):
+    """Deterministic filler text for a fixture."""
+    rng = random.Random(str(seed))
+    return ' '.join(rng.choice(WORDS) for _ in range(count))
+
+
+def post_id(site, query, index):
+    """Stable id of the index-th result of a query."""
+    return hashlib.sha1(f"{site}|{query}|{index}".encode()).hexdigest()[:12]
+
+
+def post_path(site, query, index):
+    """Path of a result post, in the form POST_URL_PATTERNS expects for the site."""
+    pid = post_id(site, query, index)
+    if site == 'x.com':
+        return f"/user{index % 7}/status/{int(pid, 16)}"
+    return f"/@author{index % 7}/{quote(query.replace(' ', '-'))}-{index}-{pid}"
+
+
+class FixtureSite:
+    """
+    Synthetic site served by a local ThreadingHTTPServer.
+
+    Search pages render the first page of results and load the rest from /feed
+    when scrolled to the bottom. A share of the posts (client_render) is only
+    filled in by JavaScript, so the HTTP fast path has to hand them to the
+    browser.
+    """
+
+    def __init__(self, site_type, options):
+        self.site_type = site_type
+        self.options = options
+        self.bytes_sent = {}
+        self.requests = 0
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.netloc = f"127.0.0.1:{self.server.server_address[1]}"
+        self.base_url = f"http://{self.netloc}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self):
+        """Start serving in a background thread."""
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the server."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def count(self, kind, size):
+        with self._lock:
+            self.requests += 1
+            self.bytes_sent[kind] = self.bytes_sent.get(kind, 0) + size
+
+    def post_urls(self, query):
+        """Every result post of a query, as full URLs."""
+        total = self.options.posts
+        return [self.base_url + post_path(self.site_type, query, i) for i in range(total)]
+
+    def is_client_rendered(self, path):
+        """Whether a post's content is only added by JavaScript."""
+        digest = int(hashlib.md5(path.encode()).hexdigest()[:8], 16)
+        return digest / 0xFFFFFFFF < self.options.client_render
+
+    # Markup
+
+    def result_items(self, query, start, stop):
+        items = []
+        for i in range(start, min(stop, self.options.posts)):
+            path = post_path(self.site_type, query, i)
+            title = words((query, i), 6).title()
+            if self.site_type == 'x.com':
+                items.append(
+                    f'<article data-testid="tweet" style="min-height:300px">'
+                    f'<a href="{path}"><time datetime="2025-01-01T00:00:00Z">Jan 1</time></a>'
+                    f'<div data-testid="tweetText">{title}</div></article>'
+                )
+            else:
+                items.append(
+                    f'<article style="min-height:300px"><h2><a href="{path}">{title}</a></h2>'
+                    f'<p>{words((query, i, "teaser"), 20)}</p></article>'
+                )
+        return ''.join(items)
+
+    def search_page(self, query):
+        per_page = self.options.page_size
+        pages = -(-self.options.posts // per_page)
+        return f"""<!DOCTYPE html><html><head><title>Search: {query}</title></head><body>
+<main id="feed">{self.result_items(query, 0, per_page)}</main>
+<script>
+var page = 1, pages = {pages}, loading = false;
+window.addEventListener('scroll', function () {{
+    if (loading || page >= pages) return;
+    if (window.innerHeight + window.scrollY < document.body.scrollHeight - 50) return;
+    loading = true;
+    fetch('/feed?q={quote(query)}&page=' + page).then(function (r) {{ return r.text(); }}).then(function (html) {{
+        document.getElementById('feed').insertAdjacentHTML('beforeend', html);
+        page += 1;
+        loading = false;
+    }});
+}});
+</script></body></html>"""
+
+    def post_body(self, path):
+        seed = path
+        paragraphs = self.options.paragraphs
+        image = f"/img/{hashlib.md5(path.encode()).hexdigest()[:10]}.png"
+        if self.site_type == 'x.com':
+            return (
+                f'<article data-testid="tweet">'
+                f'<div data-testid="User-Name">{words(seed, 2).title()}</div>'
+                f'<div data-testid="User-Username">@{words(seed, 1)}</div>'
+                f'<time datetime="2025-01-01T00:00:00Z">Jan 1</time>'
+                f'<div data-testid="tweetText">{words(seed, 40)}</div>'
+                f'<div data-testid="tweetPhoto"><img src="{image}"></div>'
+                f'<div data-testid="reply">3</div><div data-testid="retweet">5</div>'
+                f'<div data-testid="like">42</div></article>'
+            )
+        body = ''.join(
+            f'<p class="pw-post-body-paragraph" data-selectable-paragraph>{words((seed, i), 60)}</p>'
+            for i in range(paragraphs)
+        )
+        return (
+            f'<article><h1 class="pw-post-title" data-selectable-paragraph>{words(seed, 8).title()}</h1>'
+            f'<a data-testid="authorName" href="/@author">{words(seed, 2).title()}</a>'
+            f'<a data-testid="publicationName" href="/pub">Benchmark Weekly</a>'
+            f'<span data-testid="storyReadTime">{paragraphs} min read</span>'
+            f'<time datetime="2025-01-01T00:00:00Z">Jan 1, 2025</time>'
+            f'<button data-testid="headerClapButton">128</button><span class="pw-responses-count">9</span>'
+            f'{body}<figure class="paragraph-image"><img src="{image}"></figure>'
+            f'<pre>print("{words(seed, 3)}")</pre>'
+            f'<div class="pw-tags-list">{words(seed, 3)}</div></article>'
+        )
+
+    def post_page(self, path):
+        body = self.post_body(path)
+        if self.is_client_rendered(path):
+            return f"""<!DOCTYPE html><html><head><title>Post</title></head><body><div id="root"></div>
+<script>
+setTimeout(function () {{ document.getElementById('root').innerHTML = {json.dumps(body)}; }}, {self.options.lazy_ms});
+</script></body></html>"""
+        return f"<!DOCTYPE html><html><head><title>Post</title></head><body>{body}</body></html>"
+
+    def _handler(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def send(self, kind, body, content_type='text/html; charset=utf-8', status=200):
+                if isinstance(body, str):
+                    body = body.encode('utf-8')
+                if site.options.latency:
+                    t.sleep(site.options.latency / 1000)
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                site.count(kind, len(body))
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                params = parse_qs(parsed.query)
+                query = params.get('q', [''])[0]
+                if parsed.path == '/robots.txt':
+                    self.send('robots', 'User-agent: *\nAllow: /\n', 'text/plain')
+                elif parsed.path == '/search':
+                    self.send('search', site.search_page(query))
+                elif parsed.path == '/feed':
+                    page = int(params.get('page', ['1'])[0])
+                    size = site.options.page_size
+                    self.send('feed', site.result_items(query, page * size, (page + 1) * size))
+                elif parsed.path.startswith('/img/'):
+                    self.send('media', PNG_PIXEL.ljust(site.options.image_bytes, b'\0'), 'image/png')
+                elif parsed.path in ('/', ''):
+                    self.send('home', f"<html><body><h1>{site.site_type} fixture</h1></body></html>")
+                else:
+                    self.send('post', site.post_page(parsed.path))
+
+        return Handler
+
+
+def configure_pipeline(sites, workdir, options):
+    """
+    Point au.py at the fixture sites and keep all of its state in workdir.
+
+    Args:
+        sites (list): Running FixtureSite instances
+        workdir (str): Directory for output, indexes and media
+        options (argparse.Namespace): Benchmark options
+    """
+    content = os.path.join(workdir, 'scraped_content')
+    au.CONFIG.update({
+        'OUTPUT_DIR': content,
+        'MEDIA_DIR': os.path.join(workdir, 'media'),
+        'SQLITE_PATH': os.path.join(content, 'scraped_data.db'),
+        'PARQUET_DIR': os.path.join(content, 'parquet'),
+        'SEEN_INDEX_FILE': os.path.join(content, 'seen_urls.db'),
+        'FRONTIER_FILE': os.path.join(content, 'frontier.db'),
+        'CHECKPOINT_FILE': os.path.join(content, 'checkpoint.json'),
+        'SELECTOR_STATS_FILE': os.path.join(content, 'selector_stats.db'),
+        'MEDIA_INDEX_FILE': os.path.join(workdir, 'media', 'media_index.db'),
+        'METRICS_DIR': os.path.join(content, 'metrics'),
+        'PROFILE_DIR': os.path.join(content, 'profiles'),
+        'BROWSER_PIDFILE_DIR': os.path.join(content, 'browsers'),
+        'DRIVER_CACHE_FILE': os.path.join(workdir, '.geckodriver.json'),
+        'BROWSER_MODE': 'scrape',
+        'LOGIN_REQUIRED_SITES': [],
+        'MAX_POSTS': options.posts,
+        'SCRAPE_CONCURRENCY': options.concurrency,
+        'DRIVER_POOL_SIZE': options.browsers,
+        'DOWNLOAD_MEDIA': not options.no_media,
+        'DOMAIN_RATE': {site: options.rate for site in au.CONFIG['DOMAIN_RATE']},
+        'DOMAIN_CONCURRENCY': options.concurrency,
+        'DOMAIN_BURST': options.concurrency,
+        'METRICS_ENABLED': True,
+    })
+    au.CONFIG['SITE_ALIASES'] = {site.netloc: site.site_type for site in sites}
+    au.CONFIG['SEARCH_URL_TEMPLATES'] = dict(au.CONFIG['SEARCH_URL_TEMPLATES'], **{
+        site.netloc: site.base_url + '/search?q={query}' for site in sites
+    })
+    au.setup_directories()
+
+
+def run(options):
+    """
+    Run the benchmark.
+
+    Args:
+        options (argparse.Namespace): Parsed command line options
+
+    Returns:
+        dict: Benchmark report
+    """
+    sites = [FixtureSite(site_type, options).start() for site_type in options.sites]
+
+    with tempfile.TemporaryDirectory(prefix='scraper-bench-') as workdir:
+        configure_pipeline(sites, workdir, options)
+        queries = [f"benchmark query {i}" for i in range(options.queries)]
+        started = t.perf_counter()
+        try:
+            for site in sites:
+                for query in queries:
+                    if options.http_only:
+                        au.scrape_urls(site.post_urls(query))
+                    else:
+                        au.automate_search(site.base_url, query)
+            au.flush_records()
+            au.drain_media()
+        finally:
+            elapsed = t.perf_counter() - started
+            for site in sites:
+                site.stop()
+            if not options.http_only:
+                au.get_driver_pool().close()
+
+    pages = au.SCRAPE_STATS['http'] + au.SCRAPE_STATS['selenium']
+    summary = au.metrics.summary()
+    bytes_by_kind = {}
+    for site in sites:
+        for kind, size in site.bytes_sent.items():
+            bytes_by_kind[kind] = bytes_by_kind.get(kind, 0) + size
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'options': vars(options),
+        'elapsed_s': round(elapsed, 3),
+        'pages': pages,
+        'pages_per_sec': round(pages / elapsed, 3) if elapsed else 0.0,
+        'scrape_paths': {path: au.SCRAPE_STATS[path] for path in ('http', 'selenium', 'failed')},
+        'requests': sum(site.requests for site in sites),
+        'bytes': dict(bytes_by_kind, total=sum(bytes_by_kind.values())),
+        'stages': summary['stages'],
+        'counters': summary['counters']
+    }
+
+
+def parse_args(argv=None):
+    """
+    Parse command line arguments.
+
+    Args:
+        argv (list, optional): Arguments, defaults to sys.argv[1:]
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the scraper against local fixture sites.")
+    parser.add_argument('--sites', nargs='+', default=['medium.com', 'x.com'], choices=['medium.com', 'x.com'],
+                        help="fixture sites to serve (default: both)")
+    parser.add_argument('--queries', type=int, default=2, help="search queries per site")
+    parser.add_argument('--posts', type=int, default=10, help="result posts per query")
+    parser.add_argument('--page-size', type=int, default=5, help="results rendered before scrolling loads more")
+    parser.add_argument('--paragraphs', type=int, default=12, help="paragraphs per Medium post")
+    parser.add_argument('--image-bytes', type=int, default=20000, help="size of each served image")
+    parser.add_argument('--latency', type=float, default=0, help="artificial latency per request, in ms")
+    parser.add_argument('--lazy-ms', type=int, default=300,
+                        help="delay before client-rendered posts fill in their content")
+    parser.add_argument('--client-render', type=float, default=0.2,
+                        help="share of posts only rendered by JavaScript (need the browser)")
+    parser.add_argument('--concurrency', type=int, default=au.CONFIG['SCRAPE_CONCURRENCY'],
+                        help="scrape workers and per-host requests in flight")
+    parser.add_argument('--browsers', type=int, default=2, help="browser pool size")
+    parser.add_argument('--rate', type=float, default=1000.0, help="requests per second per host")
+    parser.add_argument('--no-media', action='store_true', help="don't download media")
+    parser.add_argument('--http-only', action='store_true',
+                        help="skip the browser: scrape the fixture post URLs over HTTP only")
+    parser.add_argument('--output', metavar='FILE', help="also write the JSON report to FILE")
+    parser.add_argument('--verbose', action='store_true', help="show the scraper's log output")
+    options = parser.parse_args(argv)
+    if options.http_only and options.client_render:
+        logger.warning("--http-only: serving every post server-rendered")
+        options.client_render = 0.0
+    return options
+
+
+def main(argv=None):
+    """Run the benchmark and print the JSON report."""
+    logging.basicConfig(level=logging.INFO)
+    options = parse_args(argv)
+    if not options.verbose:
+        logging.getLogger('au').setLevel(logging.WARNING)
+    report = run(options)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if options.output:
+        with open(options.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    return report['pages'] > 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)